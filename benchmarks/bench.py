@@ -0,0 +1,248 @@
+"""
+Headless benchmarks of pqgext widgets
+
+    python benchmarks/bench.py                          # all benchmarks, sizes 1e2 .. 1e6
+    python benchmarks/bench.py --sizes 1e2 1e7 --only TimeDistWidget.setData
+    python benchmarks/bench.py --output new.json --compare baseline.json --tolerance 0.2
+
+Runs on the `offscreen` Qt platform (no window is shown). With --compare the exit code is 1 if any
+benchmark got slower than the baseline by more than --tolerance.
+"""
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pyqtgraph as pg
+from pyqtgraph.Qt.QtCore import QPointF
+from pyqtgraph.Qt.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv[:1])
+
+from pqgext import TimeDistWidget, PiePlotWidget
+from pqgext._TimeDistWidget import DateAxisItem
+
+
+# ------------------------------------------------------------------
+# Registry: maps benchmark name → (function, maximal size)
+# A benchmark gets a size and returns a callable that is timed; setup is not measured.
+# ------------------------------------------------------------------
+benchmarks = {}
+
+
+def register(name, max_size=None):
+    """Decorator to register a benchmark"""
+
+    def decorator(func):
+        benchmarks[name] = (func, max_size)
+        return func
+
+    return decorator
+
+
+def _timestamps(n, span=3600 * 24 * 365):
+    rng = np.random.default_rng(0)
+    return np.sort(rng.uniform(1.7e9, 1.7e9 + span, int(n)))
+
+
+def _time_dist_widget(**kwargs):
+    w = TimeDistWidget(**kwargs)
+    w.resize(1200, 60)
+    w.show()
+    app.processEvents()
+    return w
+
+
+@register("TimeDistWidget.setData")
+def bench_time_dist_set_data(n):
+    w = _time_dist_widget()
+    ts = _timestamps(n)
+
+    def run():
+        w.setData(ts, assume_sorted=True)
+        app.processEvents()
+    return run
+
+
+@register("TimeDistWidget.panZoom")
+def bench_time_dist_pan_zoom(n):
+    w = _time_dist_widget()
+    ts = _timestamps(n)
+    w.setData(ts, assume_sorted=True)
+    app.processEvents()
+    # from the whole year down to one hour and back, panning a bit on every step
+    widths = np.geomspace(ts[-1] - ts[0], 3600, 12)
+    centers = np.linspace(ts[0] + widths[0] / 2, ts[-1] - widths[0] / 2, len(widths))
+    ranges = [(c - wd / 2, c + wd / 2) for c, wd in zip(centers, widths)]
+    ranges += ranges[::-1]
+
+    def run():
+        for xmin, xmax in ranges:
+            w.setXRange(xmin, xmax, padding=0)
+            w._on_view_changed()
+            w.grab()
+    return run
+
+
+@register("DateAxisItem.ticks", max_size=1e4)
+def bench_date_axis_ticks(n):
+    axis = DateAxisItem(orientation='bottom')
+    # `n` successive zoom steps from 10 years down to one second
+    starts = np.linspace(1.7e9, 1.7e9 + 86400, int(n))
+    lengths = np.geomspace(3600 * 24 * 3650, 1, int(n))
+
+    def run():
+        for start, length in zip(starts, lengths):
+            for spacing, values in axis.tickValues(start, start + length, 1200):
+                axis.tickStrings(values, 1.0, spacing)
+    return run
+
+
+@register("PiePlotWidget.setData", max_size=1e4)
+def bench_pie_set_data(n):
+    w = PiePlotWidget()
+    w.resize(600, 600)
+    w.show()
+    values = np.random.default_rng(0).pareto(1.2, int(n)) + 0.01
+
+    def run():
+        w.setData(values)
+        app.processEvents()
+    return run
+
+
+@register("PiePlotWidget.setData[folded]")
+def bench_pie_set_data_folded(n):
+    w = PiePlotWidget(max_slices=20)
+    w.resize(600, 600)
+    w.show()
+    values = np.random.default_rng(0).pareto(1.2, int(n)) + 0.01
+
+    def run():
+        w.setData(values)
+        app.processEvents()
+    return run
+
+
+@register("PieChartItem.hoverSweep", max_size=1e4)
+def bench_pie_hover_sweep(n):
+    w = PiePlotWidget()
+    w.resize(600, 600)
+    w.show()
+    w.setData(np.random.default_rng(0).integers(1, 100, int(n)))
+    app.processEvents()
+    item = w.pie_item
+    angles = np.linspace(0, 2 * np.pi, 720)
+    points = [QPointF(80 * np.cos(a), 80 * np.sin(a)) for a in angles]
+
+    def run():
+        for pos in points:
+            item._handle_hover(pos)
+        item._handle_hover(QPointF(1000, 1000))
+    run.widget = w  # keep the scene alive
+    return run
+
+
+# ------------------------------------------------------------------
+# Runner
+# ------------------------------------------------------------------
+def measure(func, size, repeat):
+    run = func(size)
+    run()  # warm-up
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - t0)
+    return {"min": min(times), "median": statistics.median(times), "repeat": repeat}
+
+
+def run_all(sizes, repeat, only=None):
+    results = {}
+    for name, (func, max_size) in benchmarks.items():
+        if only and name not in only:
+            continue
+        results[name] = {}
+        for size in sizes:
+            if max_size is not None and size > max_size:
+                continue
+            r = measure(func, size, repeat)
+            results[name][str(int(size))] = r
+            print(f"{name:32s} {int(size):>10d}  min {r['min'] * 1e3:10.2f} ms  median {r['median'] * 1e3:10.2f} ms",
+                  flush=True)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print ratios against the baseline, return the number of regressions"""
+    regressions = 0
+    print("\nComparison against baseline (median, current / baseline):")
+    for name, by_size in results.items():
+        for size, r in by_size.items():
+            base = baseline.get(name, {}).get(size)
+            if base is None:
+                continue
+            ratio = r["median"] / base["median"] if base["median"] > 0 else float("inf")
+            flag = ""
+            if ratio > 1.0 + tolerance:
+                flag = "  REGRESSION"
+                regressions += 1
+            elif ratio < 1.0 - tolerance:
+                flag = "  faster"
+            print(f"{name:32s} {int(size):>10d}  {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless pqgext benchmarks")
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1e2, 1e3, 1e4, 1e5, 1e6],
+                        help="data sizes, e.g. 1e2 1e7")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", help="benchmark names to run")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON written by --output")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name in benchmarks:
+            print(name)
+        return 0
+
+    results = run_all(args.sizes, args.repeat, args.only)
+
+    if args.output:
+        data = {
+            "meta": {
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "numpy": np.__version__,
+                "pyqtgraph": pg.__version__,
+                "qt": pg.Qt.QT_LIB,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(data, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
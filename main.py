@@ -49,6 +49,57 @@ def show_TimeDistWidget():
     return win
 
 
+@register("TimeLanesWidget")
+def show_TimeLanesWidget():
+    from pqgext import TimeLanesWidget
+    win = QMainWindow()
+    plot = TimeLanesWidget()
+    start, end = datetime(year=2025, month=3, day=4), datetime(year=2025, month=8, day=15)
+    lanes = {f"source {i}": [random_datetime(start, end) for _ in range(random.randint(50, 3000))] for i in range(8)}
+    plot.setData(lanes)
+    win.setCentralWidget(plot)
+    win.setWindowTitle("TimeLanesWidget")
+
+    win.resize(1100, 800)
+    win.show()
+    return win
+
+
+@register("SunburstWidget")
+def show_SunburstWidget():
+    from pqgext import SunburstWidget
+    win = QMainWindow()
+    plot = SunburstWidget(background='w')
+    tree = {f"service {s}": {f"/endpoint{e}": {status: random.randint(1, 100) for status in ("200", "404", "500")}
+                             for e in range(random.randint(2, 6))}
+            for s in range(5)}
+    plot.setData(tree)
+    win.setCentralWidget(plot)
+    win.setWindowTitle("SunburstWidget")
+
+    win.resize(900, 900)
+    win.show()
+    return win
+
+
+@register("PieGridWidget")
+def show_PieGridWidget():
+    from pqgext import PieGridWidget
+    win = QMainWindow()
+    plot = PieGridWidget(background='w', columns=12)
+    statuses = ("200", "301", "404", "500")
+    plot.setData([{s: random.randint(1, 100) for s in statuses} for _ in range(120)],
+                 titles=[f"host {i}" for i in range(120)])
+    plot.sliceClicked.connect(lambda pie, i, label, value: print(f"host {pie}: {label} = {value:g}"))
+    plot.add_legend()
+    win.setCentralWidget(plot)
+    win.setWindowTitle("PieGridWidget")
+
+    win.resize(1200, 900)
+    win.show()
+    return win
+
+
 @register("PiePlotWidget")
 def show_PiePlotWidget():
     from pqgext import PiePlotWidget
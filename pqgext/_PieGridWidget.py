@@ -0,0 +1,220 @@
+import pyqtgraph as pg
+import numpy as np
+from pyqtgraph.Qt.QtCore import QRectF, QPointF, Qt, pyqtSignal
+from pyqtgraph.Qt.QtGui import QPen, QFont
+from pyqtgraph.Qt.QtWidgets import QGraphicsItem
+from typing import Optional
+
+from ._style import style
+from ._instrument import Instrumentation, InstrumentedWidget
+from ._PiePlotWidget import PieChartItem
+
+
+class PieGridWidget(InstrumentedWidget, pg.GraphicsLayoutWidget):
+    """
+    Small multiples: many PieChartItems in one scene and one view box, laid out in a grid.
+
+    Pies share one palette (a label has the same color in every pie), one font and one set of pens. Hover and
+    clicks are routed to the pie under the cursor by grid arithmetic instead of scene hit-testing, and every
+    pie is cached as a pixmap, so repaints only redraw pies that changed.
+    """
+    sliceClicked = pyqtSignal(int, int, str, float)   # pie, slice, label, value
+    sliceHovered = pyqtSignal(int, int, str, float)
+    sliceExited  = pyqtSignal(int, int, str)
+
+    def __init__(self, parent=None, background=None, columns: int = 10, donut_ratio: float = 0.0,
+                 start_angle: float = 270, label_pen: Optional[QPen] = None, label_font: Optional[QFont] = None,
+                 title_font: Optional[QFont] = None, title_color='black', show_labels: bool = False, **kwargs):
+        super().__init__(parent=parent, **kwargs)
+        self.setBackground(background)
+        self.columns = max(int(columns), 1)
+        self.donut_ratio = donut_ratio
+        self.start_angle = start_angle
+        # shared by all pies
+        self.label_pen = label_pen if label_pen is not None else QPen(Qt.black)
+        self.label_font = label_font if label_font is not None else QFont("Arial", 8)
+        self.title_font = title_font if title_font is not None else QFont("Arial", 9, QFont.Bold)
+        self.title_color = title_color
+        self.show_labels = show_labels  # slice labels are rarely readable on small multiples, hover still labels
+        self.border_pen = style.pen('black', width=1)
+
+        self.view = self.addViewBox()
+        self.view.setAspectLocked(True)
+        self.view.setMouseEnabled(x=False, y=False)
+        self.view.wheelEvent = lambda ev: None
+
+        self.instrumentation = Instrumentation(self)
+        self.pies = []
+        self._color_index = {}  # label -> palette index, shared by all pies
+        self._palette = []
+        self._hovered = -1  # pie under the cursor
+
+        self.scene().sigMouseMoved.connect(self._on_mouse_moved)
+        self.scene().sigMouseClicked.connect(self._on_mouse_clicked)
+        style.changed.connect(self._apply_style)
+
+    @property
+    def cell_size(self) -> float:
+        """Grid pitch in item units: the pie diameter plus room for the title"""
+        return PieChartItem.radius * 2 + 60
+
+    def setData(self, pies: list, titles: Optional[list] = None):
+        """
+        `pies` is a list of {label: value} dicts or of value sequences (labels "Slice 0", ...).
+        Existing pies are updated in place; pies whose data did not change are not touched at all.
+        """
+        t0 = self.instrumentation.start()
+        data = [self._pie_data(p) for p in pies]
+        palette_changed = self._register_labels([label for _, labels in data for label in labels])
+
+        for i, (values, labels) in enumerate(data):
+            title = titles[i] if titles is not None else None
+            colors = [self._palette[self._color_index[label]] for label in labels]
+            if i < len(self.pies):
+                self._update_pie(self.pies[i], values, labels, colors, title, palette_changed)
+            else:
+                self.pies.append(self._create_pie(i, values, labels, colors, title))
+        for item in self.pies[len(data):]:
+            self.view.removeItem(item)
+        del self.pies[len(data):]
+        if self._hovered >= len(self.pies):
+            self._hovered = -1  # the hovered pie is gone, there is nothing to exit
+
+        self._fit()
+        self.instrumentation.stop('setData', t0)
+
+    def updatePie(self, index: int, values, labels=None):
+        """Change one pie in place; without `labels` it keeps its labels if the slice count is unchanged"""
+        t0 = self.instrumentation.start()
+        item = self.pies[index]
+        values = np.asarray(values, dtype=float)
+        if labels is not None:
+            labels = [str(label) for label in labels]
+        elif len(values) == len(item.labels):
+            labels = item.labels
+        else:
+            labels = [f"Slice {i}" for i in range(len(values))]
+        if self._register_labels(labels):
+            self._apply_style()  # the palette grew, every pie is recolored
+        colors = [self._palette[self._color_index[label]] for label in labels]
+        self._update_pie(item, values, labels, colors, item.title, palette_changed=False)
+        self.instrumentation.stop('updatePie', t0)
+
+    def _register_labels(self, labels) -> bool:
+        """Give new labels a palette slot, True if the palette had to grow"""
+        for label in labels:
+            if label not in self._color_index:
+                self._color_index[label] = len(self._color_index)
+        if len(self._palette) == len(self._color_index):
+            return False
+        self._palette = style.colors(len(self._color_index), alpha=220)
+        return True
+
+    @staticmethod
+    def _pie_data(pie):
+        if isinstance(pie, dict):
+            return np.asarray(list(pie.values()), dtype=float), [str(k) for k in pie.keys()]
+        values = np.asarray(pie, dtype=float)
+        return values, [f"Slice {i}" for i in range(len(values))]
+
+    def _create_pie(self, i, values, labels, colors, title):
+        item = PieChartItem(values=values, labels=labels, colors=colors, donut_ratio=self.donut_ratio,
+                            start_angle=self.start_angle, label_pen=self.label_pen, label_font=self.label_font,
+                            border_pen=self.border_pen, title=title, title_font=self.title_font,
+                            title_color=self.title_color, instrumentation=self.instrumentation,
+                            show_labels=self.show_labels)
+        # hover and clicks come from the grid, the scene does not have to test every pie
+        item.setAcceptHoverEvents(False)
+        item.setAcceptedMouseButtons(Qt.NoButton)
+        item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        row, col = divmod(i, self.columns)
+        item.setPos(col * self.cell_size, -row * self.cell_size)
+        self.view.addItem(item)
+        return item
+
+    def _update_pie(self, item, values, labels, colors, title, palette_changed):
+        if title != item.title:
+            item.title = title
+            item.generatePicture()
+        if len(values) == len(item.values) and np.array_equal(values, item.values) and labels == item.labels:
+            if palette_changed:
+                item._set_colors(colors)
+                item.update()
+            return  # unchanged, keeps its cached pixmap
+        item.setValues(values, labels=labels, colors=colors, explode=[0.0] * len(values))
+
+    def _fit(self):
+        rows = -(-len(self.pies) // self.columns)
+        cell = self.cell_size
+        half = cell / 2
+        width = min(len(self.pies), self.columns) * cell
+        self.view.setRange(QRectF(-half, half - rows * cell, max(width, cell), max(rows, 1) * cell), padding=0)
+
+    def _apply_style(self):
+        if not self._color_index:
+            return
+        self._palette = style.colors(len(self._color_index), alpha=220)
+        for item in self.pies:
+            item._set_colors([self._palette[self._color_index[label]] for label in item.labels])
+            item.update()
+
+    def add_legend(self):
+        """One legend for all pies"""
+        legend = pg.LegendItem(offset=(10, 10))
+        legend.setParentItem(self.view)
+        for label, index in self._color_index.items():
+            spot = pg.ScatterPlotItem(size=10, pen=style.pen('w', width=1), brush=style.brush(self._palette[index]),
+                                      symbol='s')
+            legend.addItem(spot, label)
+        return legend
+
+    def _pending_work(self):
+        return [(item._layout_timer, item._layout_labels) for item in self.pies]
+
+    def pieAt(self, x: float, y: float) -> int:
+        """Index of the pie whose cell contains the view point (x, y), -1 outside the grid"""
+        cell = self.cell_size
+        col = int(np.floor((x + cell / 2) / cell))
+        row = int(np.floor((cell / 2 - y) / cell))
+        if not 0 <= col < self.columns or row < 0:
+            return -1
+        index = row * self.columns + col
+        return index if index < len(self.pies) else -1
+
+    def _local_pos(self, scene_pos):
+        """(pie index, position in that pie's coordinates) under a scene position"""
+        pos = self.view.mapSceneToView(scene_pos)
+        index = self.pieAt(pos.x(), pos.y())
+        if index < 0:
+            return -1, None
+        item = self.pies[index]
+        return index, QPointF(pos.x() - item.pos().x(), pos.y() - item.pos().y())
+
+    def _on_mouse_moved(self, scene_pos):
+        index, local = self._local_pos(scene_pos)
+        if index != self._hovered and self._hovered >= 0:
+            self._hover(self._hovered, None)
+        self._hovered = index
+        if index >= 0:
+            self._hover(index, local)
+
+    def _hover(self, index, local):
+        item = self.pies[index]
+        old = item.hovered_index
+        new = item._slice_at(local.x(), local.y()) if local is not None else -1
+        if new == old:
+            return
+        item._set_hovered(new)
+        if old >= 0:
+            self.sliceExited.emit(index, old, item.labels[old])
+        if new >= 0:
+            self.sliceHovered.emit(index, new, item.labels[new], float(item.values[new]))
+
+    def _on_mouse_clicked(self, ev):
+        index, local = self._local_pos(ev.scenePos())
+        if index < 0:
+            return
+        item = self.pies[index]
+        i = item._slice_at(local.x(), local.y())
+        if i >= 0:
+            self.sliceClicked.emit(index, i, item.labels[i], float(item.values[i]))
@@ -1,31 +1,121 @@
-import random
 import pyqtgraph as pg
 import numpy as np
 from pyqtgraph.Qt.QtCore import *
 from pyqtgraph.Qt.QtGui import *
 from typing import List, Optional
 
-from ._style import style
-
+import logging
 
-class PiePlotWidget(pg.PlotWidget):
+from ._style import style
+from ._instrument import Instrumentation, InstrumentedWidget, logger
+from ._async import AsyncLoader
+
+
+def _fold(values, labels, colors, explode, level, max_slices, min_angle, other_label, other_color):
+    """
+    Slices drawn for the source indices `level`: (values, labels, colors, explode, kept sources, folded sources).
+    Pure function of its arguments, safe to call on a worker thread.
+    """
+    level_values = values[level]
+    keep = np.arange(len(level_values))
+    if (max_slices is not None or min_angle is not None) and len(level_values) > 1:
+        order = np.argsort(-level_values, kind='stable')
+        if max_slices is not None and len(level_values) > max_slices:
+            order = order[:max(max_slices - 1, 1)]  # one slice is left for "Other"
+        if min_angle is not None and level_values.sum() > 0:
+            order = order[360.0 * level_values[order] / level_values.sum() >= min_angle]
+        if len(level_values) - len(order) > 1:  # folding a single slice would only rename it
+            keep = np.sort(order)
+
+    slice_sources = level[keep]
+    rest = np.ones(len(level_values), dtype=bool)
+    rest[keep] = False
+    other_sources = level[rest]
+
+    shown_labels = [labels[i] for i in slice_sources]
+    shown_explode = [explode[i] for i in slice_sources]
+    if colors:
+        shown_colors = [colors[i] for i in slice_sources]
+    else:
+        shown_colors = style.colors(len(keep), alpha=220)
+    shown_values = level_values[keep]
+    if len(other_sources):
+        shown_values = np.append(shown_values, level_values[rest].sum())
+        shown_labels.append(f"{other_label} ({len(other_sources)})")
+        shown_colors.append(other_color)
+        shown_explode.append(0.0)
+    return shown_values, shown_labels, shown_colors, shown_explode, slice_sources, other_sources
+
+
+def _slice_paths(starts, spans, radius, donut_ratio):
+    """One QPainterPath per slice, centered at the origin; angles in degrees"""
+    inner_radius = radius * donut_ratio
+    outer_rect = QRectF(-radius, -radius, radius * 2, radius * 2)
+    inner_rect = QRectF(-inner_radius, -inner_radius, inner_radius * 2, inner_radius * 2)
+
+    paths = []
+    for start, span in zip(starts, spans):
+        path = QPainterPath()
+        if donut_ratio > 0:
+            path.arcMoveTo(outer_rect, start)  # ring segment, no spoke through the hole
+        else:
+            path.moveTo(0, 0)
+        path.arcTo(outer_rect, start, span)
+        if donut_ratio > 0:
+            path.arcTo(inner_rect, start + span, -span)
+        else:
+            path.lineTo(0, 0)
+        path.closeSubpath()
+        paths.append(path)
+    return paths
+
+
+def _prepare_pie(values, labels, colors, explode, max_slices, min_angle, other_label, other_color,
+                 start_angle, donut_ratio, radius, cancelled=lambda: False):
+    """Everything setData computes before touching graphics items, for PiePlotWidget.setDataAsync"""
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    labels = labels or [f"Slice {i}" for i in range(n)]
+    explode = explode or [0.0] * n
+    shown = _fold(values, labels, colors, explode, np.arange(n), max_slices, min_angle, other_label, other_color)
+    if cancelled():
+        return None
+    shown_values = shown[0]
+    spans = 360.0 * shown_values / shown_values.sum()
+    starts = start_angle + np.cumsum(spans) - spans
+    paths = _slice_paths(starts, spans, radius, donut_ratio)
+    return (values, labels, colors, explode), shown, paths
+
+
+class PiePlotWidget(InstrumentedWidget, pg.PlotWidget):
     sliceClicked = pyqtSignal(int, str, float)   # index, label, value
     sliceHovered = pyqtSignal(int, str, float)
     sliceExited  = pyqtSignal(int, str)
+    dataReady = pyqtSignal()  # data passed to setDataAsync has been applied
 
     def __init__(self, parent=None, background=None, donut_ratio: float = 0.0, start_angle: float = 270,
-                 label_pen=QPen(Qt.black), label_font: QFont = QFont("Arial", 20, QFont.Bold),
-                 title: Optional[str] = None, title_font: QFont = QFont("Arial", 24, QFont.Bold),
-                 title_color='black', **kwargs):
+                 label_pen: Optional[QPen] = None, label_font: Optional[QFont] = None,
+                 title: Optional[str] = None, title_font: Optional[QFont] = None,
+                 title_color='black', max_slices: Optional[int] = None, min_angle: Optional[float] = None,
+                 other_label: str = "Other", other_color: Optional[QColor] = None, refresh_interval: int = 100,
+                 **kwargs):
         super().__init__(parent=parent, background=background, **kwargs)
         self.donut_ratio = donut_ratio
         self.start_angle = start_angle
-        self.label_pen = label_pen
-        self.label_font = label_font
+        # default pens/fonts are created per instance, so importing pqgext needs no QApplication
+        self.label_pen = label_pen if label_pen is not None else QPen(Qt.black)
+        self.label_font = label_font if label_font is not None else QFont("Arial", 20, QFont.Bold)
         self.title = title
-        self.title_font = title_font
+        self.title_font = title_font if title_font is not None else QFont("Arial", 24, QFont.Bold)
         self.title_color = title_color
 
+        # folding: only the `max_slices` largest slices / slices of at least `min_angle` degrees are drawn,
+        # the rest is merged into one "Other" slice which drills down into them when clicked
+        self.max_slices = max_slices
+        self.min_angle = min_angle
+        self.other_label = other_label
+        self.other_color = other_color if other_color is not None else QColor(150, 150, 150, 220)
+
         self.hideAxis('left')
         self.hideAxis('bottom')
         self.setAspectLocked(True)
@@ -38,22 +128,271 @@ class PiePlotWidget(pg.PlotWidget):
         self.colors = []
         self.explode = []
 
+        # full data and the drill-down level (source indices) currently shown
+        self._source_values = np.zeros(0)
+        self._source_labels = []
+        self._source_colors = None
+        self._source_explode = []
+        self._level = np.zeros(0, dtype=int)
+        self._drill_stack = []
+        self._slice_sources = np.zeros(0, dtype=int)
+        self._other_sources = np.zeros(0, dtype=int)
+
         self.pie_item = None
         self.legend = None
 
+        # opt-in timings of setData/updateValues, picture regeneration, hit-tests, label layout and paint
+        self.instrumentation = Instrumentation(self)
+
+        self._loader = AsyncLoader(self)
+        self._loader.ready.connect(self._apply_prepared)
+
+        # raw categorical input (setCategories/appendCategories): counters per category in order of first
+        # appearance, so a category keeps its slice; redraws are coalesced to one per `refresh_interval` ms
+        self._category_index = {}
+        self._category_names = []
+        self._category_counts = np.zeros(0, dtype=np.int64)
+        self._category_colors = []  # color of each category slot, never changes when categories are added
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(refresh_interval)
+        self._refresh_timer.timeout.connect(self._refresh_categories)
+
+        style.changed.connect(self._apply_style)
+
+    def _apply_style(self):
+        """Recolor slices drawn with default colors in place after a palette change, geometry is kept"""
+        if self._category_names:
+            self._category_colors = []
+            self._refresh_categories()
+            return
+        if self.pie_item is None or self._source_colors:
+            return
+        self.colors = self._folded()[2]
+        self.pie_item._set_colors(self.colors)
+        self.pie_item.update()
+        if self.legend:
+            self._update_legend(colors_changed=True)
+
     def setData(self, values, labels=None, colors=None, explode=None):
-        self.values = np.asarray(values, dtype=float)
-        self.labels = labels or [f"Slice {i}" for i in range(len(values))]
-        self.colors = colors or style.generate_palette(len(values), alpha=220)
-        self.explode = explode or [0.0] * len(values)
+        t0 = self.instrumentation.start()
+        self._loader.cancel()
+        self.values, self.labels, self.colors, self.explode = self._set_source(values, labels, colors, explode)
 
         self.clear()
         if self.legend:
             self.legend.scene().removeItem(self.legend)
 
         self._create_pie()
+        self.instrumentation.stop('setData', t0)
+
+    def setDataAsync(self, values, labels=None, colors=None, explode=None):
+        """
+        `setData` with folding, palette generation and slice path building done on a QThreadPool worker;
+        the GUI thread only swaps the pie item in and emits `dataReady`. A newer call (or setData/setCategories)
+        cancels a pending one; updateValues/appendCategories calls made while it is pending are applied after it.
+        """
+        self._loader.submit(_prepare_pie, values, labels, colors, explode,
+                            self.max_slices, self.min_angle, self.other_label, self.other_color,
+                            self.start_angle, self.donut_ratio, PieChartItem.radius)
+
+    def _apply_prepared(self, prepared):
+        t0 = self.instrumentation.start()
+        (values, labels, colors, explode), shown, paths = prepared
+        self._source_values, self._source_labels, self._source_colors, self._source_explode = \
+            values, labels, colors, explode
+        self._level = np.arange(len(values))
+        self._drill_stack = []
+        self.values, self.labels, self.colors, self.explode, self._slice_sources, self._other_sources = shown
+
+        self.clear()
+        if self.legend:
+            self.legend.scene().removeItem(self.legend)
+
+        self._create_pie(paths)
+        self.instrumentation.stop('applyData', t0)
+        self.dataReady.emit()
+
+    def updateValues(self, values, labels=None, colors=None, explode=None, animate: bool = False,
+                     duration: int = 300):
+        """
+        Change values, labels and colors of the existing pie in place - slice brushes, label items and legend
+        entries are reused. With `animate` the slices tween from the old layout to the new one in `duration` ms.
+        """
+        if self._loader.defer(self.updateValues, values, labels, colors, explode, animate, duration):
+            return  # updates the pie of the pending setDataAsync once it is applied
+        if self.pie_item is None:
+            self.setData(values, labels, colors, explode)
+            return
+
+        t0 = self.instrumentation.start()
+        if self._folding():
+            values, labels, colors, explode = self._set_source(values, labels, colors, explode, keep_level=True)
+        else:
+            self._store_source(values, labels, colors, explode, keep_level=True)
+        self._apply_values(values, labels, colors, explode, animate, duration)
+        self.instrumentation.stop('updateValues', t0)
+
+    def setCategories(self, labels):
+        """Draw the counts of raw category labels (any array-like of hashables, e.g. strings or int codes)"""
+        self._loader.cancel()
+        self._category_index = {}
+        self._category_names = []
+        self._category_counts = np.zeros(0, dtype=np.int64)
+        self._category_colors = []
+        self.appendCategories(labels)
+
+    def appendCategories(self, labels):
+        """
+        Add a batch of raw category labels to the counters. Counting is vectorized (np.bincount for small
+        non-negative int codes, np.unique otherwise) and only the distinct labels of the batch are looked up,
+        the pie itself is updated in place at most once per `refresh_interval` ms.
+        """
+        if self._loader.defer(self.appendCategories, labels):
+            return
+        arr = np.asarray(labels).reshape(-1)
+        if len(arr) == 0:
+            return
+        t0 = self.instrumentation.start()
+        if arr.dtype.kind in 'iu' and arr.min() >= 0 and arr.max() < 1 << 20:
+            counts = np.bincount(arr)
+            uniques = np.flatnonzero(counts)
+            counts = counts[uniques]
+        else:
+            uniques, counts = np.unique(arr, return_counts=True)
+
+        index = self._category_index
+        slots = np.empty(len(uniques), dtype=np.int64)
+        for i, label in enumerate(uniques.tolist()):
+            slot = index.get(label)
+            if slot is None:
+                slot = index[label] = len(self._category_names)
+                self._category_names.append(str(label))
+            slots[i] = slot
+        if len(self._category_names) > len(self._category_counts):
+            self._category_counts = np.pad(self._category_counts,
+                                           (0, len(self._category_names) - len(self._category_counts)))
+        self._category_counts[slots] += counts
+
+        self.instrumentation.stop('appendCategories', t0)
+        self.instrumentation.count('categoryLabels', len(arr))
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    def categories(self) -> tuple[list[str], np.ndarray]:
+        """Category names in slice order and their counts so far"""
+        return list(self._category_names), self._category_counts.copy()
+
+    def _refresh_categories(self):
+        values = self._category_counts.astype(float)
+        labels = list(self._category_names)
+        colors = self._category_colors
+        colors.extend(style.color(k, alpha=220) for k in range(len(colors), len(labels)))
+        if self.pie_item is None:
+            self.setData(values, labels, list(colors))
+        else:
+            self.updateValues(values, labels=labels, colors=list(colors))
+
+    def _pending_work(self):
+        """A category refresh, then the label layout it may trigger"""
+        work = [(self._refresh_timer, self._refresh_categories)]
+        if self.pie_item is not None:
+            work.append((self.pie_item._layout_timer, self.pie_item._layout_labels))
+        return work
+
+    def _apply_values(self, values, labels, colors, explode, animate, duration):
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        new_colors = colors
+        if labels is None and len(self.labels) != n:
+            labels = [f"Slice {i}" for i in range(n)]
+        if new_colors is None and len(self.colors) != n:
+            new_colors = style.colors(n, alpha=220)
+        if explode is None and len(self.explode) != n:
+            explode = [0.0] * n
+
+        self.values = values
+        self.labels = labels or self.labels
+        self.colors = new_colors or self.colors
+        self.explode = explode or self.explode
+
+        self.pie_item.setValues(values, labels=labels, colors=new_colors, explode=explode,
+                                duration=duration if animate else 0)
+        if self.legend:
+            self._update_legend(colors_changed=new_colors is not None)
 
-    def _create_pie(self):
+    def sourceIndex(self, index: int) -> int:
+        """Index into the data given to setData of the drawn slice `index`, -1 for the "Other" slice"""
+        if 0 <= index < len(self._slice_sources):
+            return int(self._slice_sources[index])
+        return -1
+
+    def drillDown(self, animate: bool = True):
+        """Show the slices folded into "Other" (folded again if there are too many)"""
+        if len(self._other_sources) == 0:
+            return
+        self._drill_stack.append(self._level)
+        self._level = self._other_sources
+        self._apply_values(*self._folded(), animate=animate, duration=300)
+
+    def drillUp(self, animate: bool = True):
+        if not self._drill_stack:
+            return
+        self._level = self._drill_stack.pop()
+        self._apply_values(*self._folded(), animate=animate, duration=300)
+
+    def _folding(self):
+        return self.max_slices is not None or self.min_angle is not None
+
+    def _set_source(self, values, labels, colors, explode, keep_level=False):
+        """Store the full data and return what is displayed for it"""
+        self._store_source(values, labels, colors, explode, keep_level)
+        return self._folded()
+
+    def _store_source(self, values, labels, colors, explode, keep_level=False):
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        same = keep_level and len(self._source_values) == n
+        if not same:
+            self._level = np.arange(n)
+            self._drill_stack = []
+        else:
+            # an update of the same slices: None keeps what is stored, as in PieChartItem.setValues
+            labels = labels if labels is not None else self._source_labels
+            colors = colors if colors is not None else self._source_colors
+            explode = explode if explode is not None else self._source_explode
+        self._source_values = values
+        self._source_labels = labels or [f"Slice {i}" for i in range(n)]
+        self._source_colors = colors
+        self._source_explode = explode or [0.0] * n
+        self._slice_sources = self._level
+        self._other_sources = np.zeros(0, dtype=int)
+
+    def _folded(self):
+        """(values, labels, colors, explode) drawn for the current drill-down level"""
+        values, labels, colors, explode, self._slice_sources, self._other_sources = _fold(
+            self._source_values, self._source_labels, self._source_colors, self._source_explode, self._level,
+            self.max_slices, self.min_angle, self.other_label, self.other_color)
+        return values, labels, colors, explode
+
+    def _is_other(self, index):
+        return len(self._other_sources) > 0 and index == len(self._slice_sources)
+
+    def _on_slice_clicked(self, index, label, value):
+        self.sliceClicked.emit(self.sourceIndex(index), label, value)
+        if self._is_other(index):
+            self.drillDown()
+
+    def _on_background_clicked(self):
+        self.drillUp()
+
+    def _on_slice_hovered(self, index, label, value):
+        self.sliceHovered.emit(self.sourceIndex(index), label, value)
+
+    def _on_slice_exited(self, index, label):
+        self.sliceExited.emit(self.sourceIndex(index), label)
+
+    def _create_pie(self, paths=None):
         self.pie_item = PieChartItem(
             values=self.values,
             labels=self.labels,
@@ -65,11 +404,14 @@ class PiePlotWidget(pg.PlotWidget):
             label_font=self.label_font,
             title=self.title,
             title_font=self.title_font,
-            title_color=self.title_color
+            title_color=self.title_color,
+            instrumentation=self.instrumentation,
+            paths=paths
         )
-        self.pie_item.sliceClicked.connect(self.sliceClicked)
-        self.pie_item.sliceHovered.connect(self.sliceHovered)
-        self.pie_item.sliceExited.connect(self.sliceExited)
+        self.pie_item.sliceClicked.connect(self._on_slice_clicked)
+        self.pie_item.sliceHovered.connect(self._on_slice_hovered)
+        self.pie_item.sliceExited.connect(self._on_slice_exited)
+        self.pie_item.backgroundClicked.connect(self._on_background_clicked)
         self.addItem(self.pie_item)
 
     def add_legend(self):
@@ -78,50 +420,112 @@ class PiePlotWidget(pg.PlotWidget):
         self.legend = pg.LegendItem(offset=(80, 20))
         self.legend.setParentItem(self.getViewBox())
         for i, (label, color) in enumerate(zip(self.labels, self.colors)):
-            spot = pg.ScatterPlotItem(size=15, pen=pg.mkPen('w', width=2),
-                                      brush=pg.mkBrush(color), symbol='s')
-            self.legend.addItem(spot, label)
+            self.legend.addItem(self._legend_spot(color), label)
+
+    @staticmethod
+    def _legend_spot(color):
+        return pg.ScatterPlotItem(size=15, pen=style.pen('w', width=2), brush=style.brush(color), symbol='s')
+
+    def _update_legend(self, colors_changed=True):
+        """Retitle/recolor the existing legend entries, adding or removing only the difference"""
+        items = list(self.legend.items)
+        for i, (label, color) in enumerate(zip(self.labels, self.colors)):
+            if i >= len(items):
+                self.legend.addItem(self._legend_spot(color), label)
+                continue
+            sample, label_item = items[i]
+            if label_item.text != label:
+                label_item.setText(label)
+            if colors_changed:
+                sample.item.setBrush(style.brush(color))
+                sample.update()
+        for sample, label_item in items[len(self.labels):]:
+            self.legend.removeItem(sample.item)
 
 
 class PieChartItem(pg.GraphicsObject):
+    radius = 100
+
     sliceClicked = pyqtSignal(int, str, float)
     sliceHovered = pyqtSignal(int, str, float)
     sliceExited  = pyqtSignal(int, str)
+    backgroundClicked = pyqtSignal()  # press inside the item but outside every slice
 
     def __init__(self, values, labels, colors, explode=None,
-                 donut_ratio=0.0, start_angle=90, label_pen=QPen(Qt.black),
-                 label_font=QFont("Arial", 20, QFont.Bold), border_pen=pg.mkPen('black', width=2),
-                 title: Optional[str] = None, title_font=QFont("Arial", 16, QFont.Bold), title_color='black'):
+                 donut_ratio=0.0, start_angle=90, label_pen: Optional[QPen] = None,
+                 label_font: Optional[QFont] = None, border_pen: Optional[QPen] = None,
+                 title: Optional[str] = None, title_font: Optional[QFont] = None, title_color='black',
+                 instrumentation: Optional[Instrumentation] = None, paths: Optional[List[QPainterPath]] = None,
+                 show_labels: bool = True):
         super().__init__()
-        self.label_pen = label_pen
-        self.label_font = label_font
-        self.border_pen = border_pen
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation(self)
+        self.show_labels = show_labels  # False leaves only the hover label
+        self.label_pen = label_pen if label_pen is not None else QPen(Qt.black)
+        self.label_font = label_font if label_font is not None else QFont("Arial", 20, QFont.Bold)
+        self.border_pen = border_pen if border_pen is not None else style.pen('black', width=2)
         self.title = title
-        self.title_font = title_font
+        self.title_font = title_font if title_font is not None else QFont("Arial", 16, QFont.Bold)
         self.title_color = title_color
 
         self.values = np.asarray(values)
         self.total = self.values.sum()
         self.labels = labels
-        self.colors = [pg.mkBrush(c) for c in colors]
+        self.colors = [style.brush(c) for c in colors]
         self.explode = np.array(explode or [0.0] * len(values))
         self.donut_ratio = donut_ratio
         self.start_angle = start_angle
 
         self.hovered_index = -1
+
+        # retained geometry: one path per slice (drawn at its offset) and a pool of label items
+        self._paths = []
+        self._prebuilt_paths = paths
+        self._offsets = []
+        self._mid_angles = np.zeros(0)
+        self._start_offsets = np.zeros(0)  # slice starts relative to start_angle, degrees
+        self._ends = np.zeros(0)  # cumulative slice ends relative to start_angle, degrees
+        self._spans = np.zeros(0)
+        self._label_items = []
+        self._label_layer = pg.ItemGroup()
+        self._label_layer.setParentItem(self)
+        self._hover_label = self._make_label()
+        self._hover_label.setParentItem(self)
+        self._hover_label.hide()
+
+        # label layout is cached per (data version, font, pixel size)
+        self._data_version = 0
+        self._layout_key = None
+        self._leaders = []  # (slice edge, label anchor) lines of labels placed outside the pie
+        self._leader_pen = QPen(self.label_pen)
+        self._leader_pen.setCosmetic(True)
+        self._layout_timer = QTimer(self)
+        self._layout_timer.setSingleShot(True)
+        self._layout_timer.setInterval(0)
+        self._layout_timer.timeout.connect(self._layout_labels)
+
+        # time-based tween between two span layouts, see setValues
+        self._anim_timer = QTimer(self)
+        self._anim_timer.setInterval(16)
+        self._anim_timer.timeout.connect(self._animate)
+        self._anim_clock = QElapsedTimer()
+        self._anim_from = self._anim_to = None
+        self._anim_duration = 0
+
         self.generatePicture()
 
         self.setAcceptHoverEvents(True)
 
-    def generatePicture(self):
-        radius = 100
+    def _make_label(self):
+        txt = pg.TextItem(text="", color=self.label_pen.color(), anchor=(0.5, 0.5))
+        txt.setFont(self.label_font)
+        txt.setAcceptHoverEvents(False)
+        txt.setAcceptedMouseButtons(Qt.NoButton)
+        return txt
 
-        if hasattr(self, '_label_items'):
-            for item in self._label_items:
-                item.setParentItem(None)
-                if item.scene():
-                    item.scene().removeItem(item)
-        self._label_items = []
+    def generatePicture(self):
+        """Rebuild slice paths and labels, only needed when data or style changes"""
+        t0 = self.instrumentation.start()
+        radius = self.radius
 
         if self.title:
             if not hasattr(self, 'title_item'):  # create only once
@@ -139,93 +543,232 @@ class PieChartItem(pg.GraphicsObject):
             self.title_item.setPos(0, title_y)
             self.title_item.setAnchor((0.5, 1))
 
-        self.picture = QPicture()
-        p = QPainter(self.picture)
-        p.setRenderHint(QPainter.Antialiasing)
+        self._data_version += 1
+        self._update_angle_tables()
+        self._build_geometry()
+        self.instrumentation.stop('generatePicture', t0)
 
-        if self.hovered_index == -1:
-            # random so the labels are likely not to be over each other
-            label_radiuses = [radius * (random.randint(30, 100)/100.0 if self.donut_ratio == 0 else (1.0 + self.donut_ratio) * 0.5) for _ in range(len(self.values))]
+    def _build_geometry(self):
+        """Slice paths and offsets from the current angle tables, labels too unless animating"""
+        if self._prebuilt_paths is not None and len(self._prebuilt_paths) == len(self.values):
+            self._paths = self._prebuilt_paths  # built by setDataAsync on a worker thread
         else:
-            label_radiuses = [radius * (0.65 if self.donut_ratio == 0 else (1.0 + self.donut_ratio) * 0.5) for _ in range(len(self.values))]
-        inner_radius = radius * self.donut_ratio
-        center = QPointF(0, 0)
-        current_angle = self.start_angle
-
-        slices = []
-
-        for i, value in enumerate(self.values):
-            angle_span = 360.0 * value / self.total
-
-            explode_offset = self.explode[i] * 12
-            if i == self.hovered_index and len(self.values) > 1:
-                explode_offset += 8
-
-            mid_angle_rad = np.deg2rad(current_angle + angle_span / 2)
-            offset = QPointF(
-                explode_offset * np.cos(mid_angle_rad),
-                -explode_offset * np.sin(mid_angle_rad)
-            )
-
-            slices.append({
-                'offset': offset,
-                'start_angle': current_angle,
-                'span': angle_span,
-                'color': self.colors[i],
-                'hovered': i == self.hovered_index,
-                'show_label': (self.hovered_index == -1) or (i == self.hovered_index),
-                'label': self.labels[i],
-                'mid_angle': current_angle + angle_span / 2,
-            })
-
-            current_angle += angle_span
-
-        for s in slices:
-            path = QPainterPath()
-            path.moveTo(center + s['offset'])
-            path.arcTo(QRectF(-radius, -radius, radius * 2, radius * 2).translated(s['offset']),
-                       s['start_angle'], s['span'])
-            if self.donut_ratio > 0:
-                path.arcTo(
-                    QRectF(-inner_radius, -inner_radius, inner_radius * 2, inner_radius * 2).translated(s['offset']),
-                    s['start_angle'] + s['span'], -s['span'])
-            else:
-                path.lineTo(center + s['offset'])
-            path.closeSubpath()
-
-            p.setBrush(s['color'])
-            p.setPen(self.border_pen)
-            p.drawPath(path)
-
-        p.setFont(QFont("Arial", 11, QFont.Bold))
+            self._paths = _slice_paths(self.start_angle + self._start_offsets, self._spans, self.radius,
+                                       self.donut_ratio)
+        self._prebuilt_paths = None
+        self._offsets = [self._slice_offset(i) for i in range(len(self.values))]
+
+        if not self._anim_timer.isActive():
+            self._layout_labels()
+        self._set_hovered_label()
+        self.update()
+
+    def _pixel_size(self):
+        """Item units per screen pixel (x, y), None while the item is not in a view"""
+        vx, vy = self.pixelVectors()
+        if vx is None or vx.isNull() or vy.isNull():
+            return None
+        return np.hypot(vx.x(), vx.y()), np.hypot(vy.x(), vy.y())
+
+    def viewTransformChanged(self):
+        # zooming/resizing changes the view transform several times per event loop pass, lay out once
+        if not self._layout_timer.isActive():
+            self._layout_timer.start()
+
+    def _layout_labels(self):
+        """
+        Deterministic label placement: larger slices first, each label inside its slice at the first radius
+        that does not collide with an already placed label, otherwise outside the pie with a leader line,
+        otherwise hidden. The result is cached until the data, the font or the zoom changes.
+        """
+        if not self.show_labels:
+            return
+        pixel = self._pixel_size()
+        if pixel is None:
+            return  # label sizes are in pixels, wait until the item is in a view
+        key = (self._data_version, self.label_font.key(), tuple(np.round(pixel, 4)))
+        if key == self._layout_key:
+            return
+        self._layout_key = key
+        t0 = self.instrumentation.start()
 
-        for i, s in enumerate(slices):
-            if not s['show_label']:
+        radius = self.radius
+        if self.donut_ratio == 0:
+            inside = (0.65, 0.5, 0.8, 0.35)
+        else:
+            inside = ((1.0 + self.donut_ratio) * 0.5,)
+        outside = (1.1, 1.2)
+        metrics = QFontMetricsF(self.label_font)
+        px, py = pixel
+
+        # placed rectangles bucketed into a grid of one label height, collisions only look at nearby cells
+        cell = (metrics.height() + 2) * py
+        grid = {}
+
+        def cells(rect):
+            for cx in range(int(np.floor(rect.left() / cell)), int(np.floor(rect.right() / cell)) + 1):
+                for cy in range(int(np.floor(rect.top() / cell)), int(np.floor(rect.bottom() / cell)) + 1):
+                    yield cx, cy
+
+        def collides(rect):
+            return any(rect.intersects(r) for c in cells(rect) for r in grid.get(c, ()))
+
+        placements = []
+        self._leaders = []
+        for i in np.argsort(-self._spans, kind='stable'):
+            if self._spans[i] <= 0:
                 continue
-            if s['span'] <= 8 and self.hovered_index != slices.index(s):
+            text_rect = metrics.boundingRect(self.labels[i])
+            w, h = (text_rect.width() + 6) * px, (text_rect.height() + 2) * py
+
+            angle_rad = np.deg2rad(self._mid_angles[i])
+            direction = QPointF(np.cos(angle_rad), -np.sin(angle_rad))
+            base = self._offsets[i]
+
+            position = None
+            if self._spans[i] > 8:
+                for f in inside:
+                    pos = base + direction * (radius * f)
+                    rect = QRectF(pos.x() - w / 2, pos.y() - h / 2, w, h)
+                    if not collides(rect):
+                        position, anchor = pos, (0.5, 0.5)
+                        break
+            if position is None:
+                right = direction.x() >= 0
+                for f in outside:
+                    pos = base + direction * (radius * f)
+                    rect = QRectF(pos.x() if right else pos.x() - w, pos.y() - h / 2, w, h)
+                    if not collides(rect):
+                        position, anchor = pos, (0.0 if right else 1.0, 0.5)
+                        self._leaders.append((base + direction * radius, pos))
+                        break
+            if position is None:
                 continue
 
-            angle_rad = np.deg2rad(s['mid_angle'])
-            label_pos = center + s['offset'] + QPointF(
-                label_radiuses[i] * np.cos(angle_rad),
-                -label_radiuses[i] * np.sin(angle_rad)
-            )
-
-            txt = pg.TextItem(
-                text=s['label'],
-                color=self.label_pen.color(),
-                anchor=(0.5, 0.5)  # perfectly centered
-            )
-            txt.setFont(self.label_font)  # ←←← real 11 pt font that scales properly!
-            txt.setParentItem(self)  # child of the pie → moves/zooms with it
-            txt.setPos(label_pos)
-            txt.setAcceptHoverEvents(False)
-            self._label_items.append(txt)
+            for c in cells(rect):
+                grid.setdefault(c, []).append(rect)
+            placements.append((i, position, anchor))
 
-        p.end()
+        # label items are pooled: only as many exist as labels fit on the screen
+        for k in range(len(self._label_items), len(placements)):
+            txt = self._make_label()
+            txt.setParentItem(self._label_layer)
+            self._label_items.append(txt)
+        for txt, (i, position, anchor) in zip(self._label_items, placements):
+            if txt.textItem.toPlainText() != self.labels[i]:
+                txt.setText(self.labels[i])
+            txt.setAnchor(anchor)
+            txt.setPos(position)
+            txt.show()
+        for txt in self._label_items[len(placements):]:
+            txt.hide()
+        self.update()
+        self.instrumentation.stop('labelLayout', t0)
+
+    def setValues(self, values, labels=None, colors=None, explode=None, duration: int = 0):
+        """
+        Replace the data in place; `None` keeps the current labels/colors/explode, or uses defaults if the
+        number of slices changed. Brushes and label items are reused. With `duration` (ms) the slices tween to
+        the new layout; frames are driven by elapsed time, so a slow frame is skipped rather than delaying
+        the animation.
+        """
+        old_spans = self._spans
+        self.values = np.asarray(values)
+        self.total = self.values.sum()
+        n = len(self.values)
+        if labels is None and len(self.labels) != n:
+            labels = [f"Slice {i}" for i in range(n)]
+        if colors is None and len(self.colors) != n:
+            colors = style.colors(n, alpha=220)
+        if explode is None and len(self.explode) != n:
+            explode = [0.0] * n
+        if labels is not None:
+            self.labels = labels
+        if colors is not None:
+            self._set_colors(colors)
+        if explode is not None:
+            self.explode = np.array(explode)
+        if self.hovered_index >= n:
+            self.hovered_index = -1
+        self._data_version += 1
+
+        if duration > 0 and 0 < len(old_spans) <= n:
+            self._anim_from = np.pad(old_spans, (0, n - len(old_spans)))
+            self._anim_to = 360.0 * self.values / self.total
+            self._anim_duration = duration
+            self._anim_clock.start()
+            self._anim_timer.start()
+            self._animate()
+        else:
+            self._anim_timer.stop()
+            self._update_angle_tables()
+            self._build_geometry()
+
+    def _set_colors(self, colors):
+        self.colors = [style.brush(c) for c in colors]  # interned, shared brushes are never modified
+
+    def _animate(self):
+        t = min(self._anim_clock.elapsed() / self._anim_duration, 1.0)
+        eased = 1.0 - (1.0 - t) ** 3
+        if t >= 1.0:
+            self._anim_timer.stop()
+            self._update_angle_tables()
+        else:
+            self._update_angle_tables(self._anim_from + (self._anim_to - self._anim_from) * eased)
+        self._build_geometry()
+
+    def _update_angle_tables(self, spans=None):
+        self._spans = 360.0 * self.values / self.total if spans is None else spans
+        self._ends = np.cumsum(self._spans)
+        self._start_offsets = self._ends - self._spans
+        self._mid_angles = self.start_angle + self._start_offsets + self._spans / 2
+
+    def _slice_offset(self, i):
+        explode_offset = self.explode[i] * 12
+        if i == self.hovered_index and len(self.values) > 1:
+            explode_offset += 8
+        mid_angle_rad = np.deg2rad(self._mid_angles[i])
+        return QPointF(explode_offset * np.cos(mid_angle_rad), -explode_offset * np.sin(mid_angle_rad))
+
+    def _set_hovered_label(self):
+        """All labels when nothing is hovered, otherwise only the hovered one"""
+        i = self.hovered_index
+        if i < 0:
+            self._hover_label.hide()
+            self._label_layer.setVisible(not self._anim_timer.isActive())
+            return
+        label_radius = self.radius * (0.65 if self.donut_ratio == 0 else (1.0 + self.donut_ratio) * 0.5)
+        angle_rad = np.deg2rad(self._mid_angles[i])
+        self._hover_label.setText(self.labels[i])
+        self._hover_label.setPos(self._offsets[i] + QPointF(label_radius * np.cos(angle_rad),
+                                                            -label_radius * np.sin(angle_rad)))
+        self._label_layer.hide()
+        self._hover_label.show()
+
+    def _set_hovered(self, index):
+        """Move the previously and newly hovered slices and swap the labels, O(1) in the number of slices"""
+        old = self.hovered_index
+        self.hovered_index = index
+        for i in (old, index):
+            if 0 <= i < len(self._offsets):
+                self._offsets[i] = self._slice_offset(i)
+        self._set_hovered_label()
+        self.update()
 
     def paint(self, p, *args):
-        p.drawPicture(0, 0, self.picture)
+        t0 = self.instrumentation.start()
+        p.setRenderHint(QPainter.Antialiasing)
+        p.setPen(self.border_pen)
+        for path, offset, brush in zip(self._paths, self._offsets, self.colors):
+            p.translate(offset)
+            p.setBrush(brush)
+            p.drawPath(path)
+            p.translate(-offset)
+        if self._leaders and self.hovered_index < 0:
+            p.setPen(self._leader_pen)
+            for start, end in self._leaders:
+                p.drawLine(start, end)
+        self.instrumentation.stop('paintItem', t0)
 
     def boundingRect(self):
         return QRectF(-130, -130, 260, 260)
@@ -241,9 +784,7 @@ class PieChartItem(pg.GraphicsObject):
     def hoverLeaveEvent(self, ev):
         if self.hovered_index != -1:
             old = self.hovered_index
-            self.hovered_index = -1
-            self.generatePicture()
-            self.update()
+            self._set_hovered(-1)
             self.sliceExited.emit(old, self.labels[old])
         ev.accept()
 
@@ -251,37 +792,69 @@ class PieChartItem(pg.GraphicsObject):
         index = self._get_slice_at_pos(ev.pos())
         if index >= 0:
             self.sliceClicked.emit(index, self.labels[index], float(self.values[index]))
-            print(f"CLICKED → {self.labels[index]} ({self.values[index]:.1f})")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("CLICKED → %s (%.1f)", self.labels[index], self.values[index])
+        else:
+            self.backgroundClicked.emit()
         ev.accept()
 
     def _handle_hover(self, pos, enter=True):
         index = self._get_slice_at_pos(pos)
         if index != self.hovered_index:
             old = self.hovered_index
-            self.hovered_index = index
-            self.generatePicture()
-            self.update()
+            self._set_hovered(index)
 
             if index >= 0:
                 self.sliceHovered.emit(index, self.labels[index], float(self.values[index]))
-                print(f"HOVER IN → {self.labels[index]} ({self.values[index]:.1f})")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("HOVER IN → %s (%.1f)", self.labels[index], self.values[index])
             elif old >= 0:
                 self.sliceExited.emit(old, self.labels[old])
-                print(f"HOVER OUT → {self.labels[old]}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("HOVER OUT → %s", self.labels[old])
 
     def _get_slice_at_pos(self, pos):
-        dx, dy = pos.x(), pos.y()
-        dist = np.hypot(dx, dy)
-        if dist > 115 or (self.donut_ratio > 0 and dist < self.donut_ratio * 100):
-            return -1
-
-        angle = np.degrees(np.arctan2(-dy, dx)) % 360
-        angle = (angle - self.start_angle) % 360
+        return self.sliceAt(pos.x(), pos.y())
+
+    def sliceAt(self, x: float, y: float) -> int:
+        """Index of the slice drawn at item coordinates (x, y) or -1; O(log n) plus the number of moved slices"""
+        t0 = self.instrumentation.start()
+        index = self._slice_at(x, y)
+        self.instrumentation.stop('hitTest', t0)
+        return index
+
+    def _slice_at(self, x, y):
+        # exploded/hovered slices are tested where they are drawn, not where they would be
+        moved = np.flatnonzero(self.explode)
+        if self.hovered_index >= 0:
+            moved = np.append(moved, self.hovered_index)
+        for i in moved:
+            offset = self._offsets[i]
+            if offset.isNull():
+                continue
+            if self._in_ring(x - offset.x(), y - offset.y()) and self._angle_index(x - offset.x(), y - offset.y()) == i:
+                return int(i)
 
-        cum = 0
-        for i, val in enumerate(self.values):
-            span = 360 * val / self.total
-            if cum <= angle < cum + span:
-                return i
-            cum += span
-        return -1
\ No newline at end of file
+        if not self._in_ring(x, y):
+            return -1
+        index = self._angle_index(x, y)
+        if index >= 0 and not self._offsets[index].isNull():
+            return -1  # that slice has been moved away from here
+        return index
+
+    def sliceBounds(self, i: int) -> tuple[float, float, float, float, float, float]:
+        """(start angle, span, inner radius, outer radius, x offset, y offset) of slice `i`, angles in degrees"""
+        offset = self._offsets[i]
+        return (float(self.start_angle + self._start_offsets[i]), float(self._spans[i]),
+                self.radius * self.donut_ratio, float(self.radius), offset.x(), offset.y())
+
+    def _in_ring(self, x, y):
+        dist = np.hypot(x, y)
+        return self.radius * self.donut_ratio <= dist <= self.radius
+
+    def _angle_index(self, x, y):
+        if len(self._ends) == 0:
+            return -1
+        angle = (np.degrees(np.arctan2(-y, x)) - self.start_angle) % 360
+        index = int(np.searchsorted(self._ends, angle, side='right'))
+        return index if index < len(self._ends) else -1
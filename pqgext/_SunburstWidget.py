@@ -0,0 +1,457 @@
+import pyqtgraph as pg
+import numpy as np
+from pyqtgraph.Qt.QtCore import QRectF, QTimer, QElapsedTimer, Qt, pyqtSignal
+from pyqtgraph.Qt.QtGui import QPainter, QPen, QFont
+from typing import Optional
+
+import logging
+
+from ._style import style
+from ._instrument import Instrumentation, InstrumentedWidget, logger
+from ._PiePlotWidget import _slice_paths
+
+
+def _build_tree(data, values=None):
+    """
+    Flatten a hierarchy into breadth-first arrays (names, parent, depth, value, child_start, child_end, rings).
+
+    `data` is a nested dict {name: number or dict}, or - with `values` - a list of name paths (tuples) whose
+    leaves get `values`. Node 0 is the root; the children of a node and the nodes of one depth are contiguous,
+    so ring d is nodes [rings[d], rings[d + 1]). Values of inner nodes are the sums of their subtrees.
+    """
+    if values is not None:
+        tree = {}
+        for path, value in zip(data, values):
+            *heads, leaf = path if isinstance(path, (tuple, list)) else (path,)
+            node = tree
+            for name in heads:
+                node = node.setdefault(name, {})
+                if not isinstance(node, dict):
+                    raise ValueError(f"'{name}' of path {path} is both a leaf and an inner node")
+            if isinstance(node.get(leaf), dict):
+                raise ValueError(f"Path {path} ends at an inner node")
+            node[leaf] = node.get(leaf, 0.0) + float(value)
+        data = tree
+
+    names, parent, depth, leaf_values, child_start, child_end = [""], [-1], [0], [0.0], [], []
+    objects = [data]
+    i = 0
+    while i < len(objects):  # breadth-first, one pass over the nodes
+        obj = objects[i]
+        child_start.append(len(objects))
+        if isinstance(obj, dict):
+            d = depth[i] + 1
+            for name, child in obj.items():
+                names.append(str(name))
+                parent.append(i)
+                depth.append(d)
+                objects.append(child)
+                leaf_values.append(0.0 if isinstance(child, dict) else max(float(child), 0.0))
+        child_end.append(len(objects))
+        i += 1
+
+    parent = np.array(parent, dtype=np.int64)
+    depth = np.array(depth, dtype=np.int64)
+    value = np.array(leaf_values, dtype=np.float64)
+    rings = np.searchsorted(depth, np.arange(depth[-1] + 2))
+    for d in range(depth[-1], 0, -1):
+        lo, hi = rings[d], rings[d + 1]
+        np.add.at(value, parent[lo:hi], value[lo:hi])
+    return (names, parent, depth, value, np.array(child_start, dtype=np.int64),
+            np.array(child_end, dtype=np.int64), rings)
+
+
+def _angle_tables(parent, value, child_start, rings):
+    """Start and span (degrees, root = full circle) of every node, one vectorized pass per ring"""
+    n = len(parent)
+    start = np.zeros(n)
+    span = np.zeros(n)
+    span[0] = 360.0
+    for d in range(1, len(rings) - 1):
+        lo, hi = rings[d], rings[d + 1]
+        p = parent[lo:hi]
+        total = value[p]
+        spans = span[p] * value[lo:hi] / np.where(total > 0, total, 1.0)
+        before = np.cumsum(spans) - spans
+        start[lo:hi] = start[p] + before - before[child_start[p] - lo]  # cumulative within the siblings
+        span[lo:hi] = spans
+    return start, span
+
+
+class SunburstWidget(InstrumentedWidget, pg.PlotWidget):
+    sliceClicked = pyqtSignal(int, str, float)   # node, name, value
+    sliceHovered = pyqtSignal(int, str, float)
+    sliceExited  = pyqtSignal(int, str)
+    focusChanged = pyqtSignal(int)  # node shown in the center
+
+    def __init__(self, parent=None, background=None, donut_ratio: float = 0.25, start_angle: float = 270,
+                 max_depth: int = 3, min_angle: float = 0.5, label_angle: float = 12,
+                 label_pen: Optional[QPen] = None, label_font: Optional[QFont] = None, duration: int = 300,
+                 **kwargs):
+        super().__init__(parent=parent, background=background, **kwargs)
+        self.donut_ratio = donut_ratio
+        self.start_angle = start_angle
+        self.max_depth = max_depth  # rings drawn around the focused node
+        self.min_angle = min_angle  # narrower segments are not drawn
+        self.label_angle = label_angle  # narrower segments get no label
+        self.label_pen = label_pen if label_pen is not None else QPen(Qt.black)
+        self.label_font = label_font if label_font is not None else QFont("Arial", 10)
+        self.duration = duration
+
+        self.hideAxis('left')
+        self.hideAxis('bottom')
+        self.setAspectLocked(True)
+        self.getViewBox().setMouseEnabled(x=False, y=False)
+        self.getViewBox().wheelEvent = lambda ev: None
+
+        self.instrumentation = Instrumentation(self)
+        self.sunburst_item = None
+
+        style.changed.connect(self._apply_style)
+
+    def setData(self, data, values=None):
+        """
+        Hierarchical data: a nested dict {name: value or dict} or a list of name paths (tuples) plus `values`,
+        e.g. setData([("api", "/users", "200"), ("api", "/users", "500")], [120, 3]).
+        """
+        t0 = self.instrumentation.start()
+        tree = _build_tree(data, values)
+        if self.sunburst_item is None:
+            self.sunburst_item = SunburstItem(tree, donut_ratio=self.donut_ratio, start_angle=self.start_angle,
+                                              max_depth=self.max_depth, min_angle=self.min_angle,
+                                              label_angle=self.label_angle, label_pen=self.label_pen,
+                                              label_font=self.label_font, instrumentation=self.instrumentation)
+            self.sunburst_item.sliceClicked.connect(self._on_slice_clicked)
+            self.sunburst_item.sliceHovered.connect(self.sliceHovered)
+            self.sunburst_item.sliceExited.connect(self.sliceExited)
+            self.sunburst_item.backgroundClicked.connect(self.drillUp)
+            self.addItem(self.sunburst_item)
+        else:
+            self.sunburst_item.setTree(tree)
+        self.instrumentation.stop('setData', t0)
+
+    @property
+    def focus(self) -> int:
+        return self.sunburst_item.focus if self.sunburst_item is not None else 0
+
+    def drillDown(self, node: int, animate: bool = True):
+        """Put `node` in the center, its subtree fills the rings"""
+        item = self.sunburst_item
+        if item is None or node == item.focus or item.child_end[node] == item.child_start[node]:
+            return
+        item.setFocusNode(node, self.duration if animate else 0)
+        self.focusChanged.emit(node)
+
+    def drillUp(self, animate: bool = True):
+        item = self.sunburst_item
+        if item is None or item.focus == 0:
+            return
+        node = int(item.parent[item.focus])
+        item.setFocusNode(node, self.duration if animate else 0)
+        self.focusChanged.emit(node)
+
+    def nodePath(self, node: int) -> tuple[str, ...]:
+        """Names from the top level down to `node`"""
+        item = self.sunburst_item
+        path = []
+        while node > 0:
+            path.append(item.names[node])
+            node = int(item.parent[node])
+        return tuple(reversed(path))
+
+    def nodeValue(self, node: int) -> float:
+        return float(self.sunburst_item.value[node])
+
+    def _pending_work(self):
+        """A running drill animation is finished"""
+        if self.sunburst_item is None:
+            return []
+        return [(self.sunburst_item._anim_timer, self.sunburst_item._finish_animation)]
+
+    def _apply_style(self):
+        if self.sunburst_item is not None:
+            self.sunburst_item.restyle()
+
+    def _on_slice_clicked(self, node, name, value):
+        self.sliceClicked.emit(node, name, value)
+        self.drillDown(node)
+
+
+class SunburstItem(pg.GraphicsObject):
+    """
+    Rings of a breadth-first tree around the focused node. Angles of all nodes are precomputed once
+    (`_angle_tables`); a view is the window (start, span, depth) of the focused node, so drilling only maps the
+    precomputed angles into a new window. Only the `max_depth` rings below the focus and segments of at least
+    `min_angle` degrees are turned into paths, which keeps the drawn part small for trees of any size.
+    """
+    radius = 100
+
+    sliceClicked = pyqtSignal(int, str, float)
+    sliceHovered = pyqtSignal(int, str, float)
+    sliceExited  = pyqtSignal(int, str)
+    backgroundClicked = pyqtSignal()  # press inside the item but outside every segment (e.g. the center)
+
+    def __init__(self, tree, donut_ratio=0.25, start_angle=270, max_depth=3, min_angle=0.5, label_angle=12,
+                 label_pen: Optional[QPen] = None, label_font: Optional[QFont] = None,
+                 border_pen: Optional[QPen] = None, instrumentation: Optional[Instrumentation] = None):
+        super().__init__()
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation(self)
+        self.donut_ratio = donut_ratio
+        self.start_angle = start_angle
+        self.max_depth = max(int(max_depth), 1)
+        self.min_angle = min_angle
+        self.label_angle = label_angle
+        self.label_pen = label_pen if label_pen is not None else QPen(Qt.black)
+        self.label_font = label_font if label_font is not None else QFont("Arial", 10)
+        self.border_pen = border_pen if border_pen is not None else style.pen('w', width=1)
+        self._hover_pen = style.pen('black', width=2)
+
+        # drawn segments: flat lists for paint, per-ring arrays for hit-testing
+        self._paths = []
+        self._brushes = []
+        self._nodes = np.zeros(0, dtype=np.int64)
+        self._rings = []  # (inner, outer, starts, ends, first flat index) relative to start_angle
+        self._brush_cache = {}
+        self._label_items = []
+        self._center_label = pg.TextItem("", color=self.label_pen.color(), anchor=(0.5, 0.5))
+        self._center_label.setFont(self.label_font)
+        self._center_label.setParentItem(self)
+        self.hovered = -1  # flat index into the drawn segments
+
+        # drilling tweens the window from the old focus to the new one
+        self._anim_timer = QTimer(self)
+        self._anim_timer.setInterval(16)
+        self._anim_timer.timeout.connect(self._animate)
+        self._anim_clock = QElapsedTimer()
+        self._anim_from = self._anim_to = None
+        self._anim_duration = 0
+
+        self.setTree(tree)
+        self.setAcceptHoverEvents(True)
+
+    def setTree(self, tree):
+        (self.names, self.parent, self.depth, self.value, self.child_start, self.child_end,
+         self.rings) = tree
+        self.start, self.span = _angle_tables(self.parent, self.value, self.child_start, self.rings)
+        # top-level ancestor of every node, picks the color family
+        self.top = np.arange(len(self.parent))
+        for d in range(2, len(self.rings) - 1):
+            lo, hi = self.rings[d], self.rings[d + 1]
+            self.top[lo:hi] = self.top[self.parent[lo:hi]]
+        self._brush_cache = {}
+        self._top_colors = style.colors(max(int(self.rings[2] - self.rings[1]), 1) if len(self.rings) > 2 else 1,
+                                        alpha=230)
+        self.focus = 0
+        self._anchor = 0
+        self._anim_timer.stop()
+        self._window = self._node_window(0)
+        self._build()
+
+    def restyle(self):
+        n_top = int(self.rings[2] - self.rings[1]) if len(self.rings) > 2 else 1
+        self._top_colors = style.colors(max(n_top, 1), alpha=230)
+        self._brush_cache = {}
+        self._brushes = [self._brush(int(i)) for i in self._nodes]
+        self.update()
+
+    def _node_window(self, node):
+        return np.array([self.start[node], max(self.span[node], 1e-9), float(self.depth[node])])
+
+    def _ancestors(self, node):
+        chain = [node]
+        while node > 0:
+            node = int(self.parent[node])
+            chain.append(node)
+        return chain
+
+    def setFocusNode(self, node: int, duration: int = 0):
+        """Show `node` in the center, tweening for `duration` ms (not QGraphicsItem.setFocus)"""
+        old = self.focus
+        self.focus = int(node)
+        # draw the subtree of the common ancestor while moving, so both old and new rings are there
+        ancestors = set(self._ancestors(old))
+        self._anchor = next(a for a in self._ancestors(self.focus) if a in ancestors)
+        target = self._node_window(self.focus)
+        if duration > 0:
+            self._anim_from = self._window
+            self._anim_to = target
+            self._anim_duration = duration
+            self._anim_clock.start()
+            self._anim_timer.start()
+            self._animate()
+        else:
+            self._anim_timer.stop()
+            self._anchor = self.focus
+            self._window = target
+            self._build()
+
+    def _animate(self):
+        elapsed = self._anim_clock.elapsed() if self._anim_clock.isValid() else self._anim_duration
+        t = min(elapsed / self._anim_duration, 1.0)
+        eased = 1.0 - (1.0 - t) ** 3
+        if t >= 1.0:
+            self._anim_timer.stop()
+            self._anchor = self.focus
+            self._window = self._anim_to
+        else:
+            self._window = self._anim_from + (self._anim_to - self._anim_from) * eased
+        self._build()
+
+    def _finish_animation(self):
+        """Jump to the last frame"""
+        self._anim_clock.invalidate()
+        self._animate()
+
+    def _visible_ranges(self):
+        """(depth, lo, hi) of the anchor's descendants down to `max_depth` rings below the focus"""
+        lo = hi = self._anchor
+        hi += 1
+        last = min(int(self.depth[self.focus]) + self.max_depth, len(self.rings) - 2)
+        ranges = []
+        for d in range(int(self.depth[self._anchor]) + 1, last + 1):
+            lo, hi = self.child_start[lo], self.child_end[hi - 1]
+            if hi <= lo:
+                break
+            ranges.append((d, int(lo), int(hi)))
+        return ranges
+
+    def _brush(self, node):
+        key = (int(self.top[node]), int(self.depth[node]))
+        brush = self._brush_cache.get(key)
+        if brush is None:
+            color = self._top_colors[(key[0] - self.rings[1]) % len(self._top_colors)]
+            brush = self._brush_cache[key] = style.brush(color.lighter(100 + 15 * (key[1] - 1)))
+        return brush
+
+    def _build(self):
+        """Paths, brushes and hit-test tables of the segments visible in the current window"""
+        t0 = self.instrumentation.start()
+        a0, width, d0 = self._window
+        hole = self.radius * self.donut_ratio
+        ring = (self.radius - hole) / self.max_depth
+        scale = 360.0 / width
+
+        paths, nodes, rings = [], [], []
+        for d, lo, hi in self._visible_ranges():
+            inner = hole + (d - d0 - 1) * ring
+            outer = min(inner + ring, self.radius)
+            inner = max(inner, hole)
+            if outer - inner <= 1e-6:
+                continue
+            starts = np.clip((self.start[lo:hi] - a0) * scale, 0.0, 360.0)
+            ends = np.clip((self.start[lo:hi] + self.span[lo:hi] - a0) * scale, 0.0, 360.0)
+            keep = np.flatnonzero(ends - starts >= self.min_angle)
+            if len(keep) == 0:
+                continue
+            starts, ends = starts[keep], ends[keep]
+            rings.append((inner, outer, starts, ends, len(nodes)))
+            nodes.extend((lo + keep).tolist())
+            paths.extend(_slice_paths(self.start_angle + starts, ends - starts, outer, inner / outer))
+
+        self._paths = paths
+        self._nodes = np.array(nodes, dtype=np.int64)
+        self._brushes = [self._brush(i) for i in nodes]
+        self._rings = rings
+        self.hovered = -1
+        self._layout_labels()
+        self.update()
+        self.instrumentation.count('segments', len(nodes))
+        self.instrumentation.stop('build', t0)
+
+    def _layout_labels(self):
+        """Labels of segments wider than `label_angle`, from a pool of text items; none while animating"""
+        placed = 0
+        if not self._anim_timer.isActive():
+            for inner, outer, starts, ends, first in self._rings:
+                for j in np.flatnonzero(ends - starts >= self.label_angle):
+                    if placed == len(self._label_items):
+                        txt = pg.TextItem("", color=self.label_pen.color(), anchor=(0.5, 0.5))
+                        txt.setFont(self.label_font)
+                        txt.setParentItem(self)
+                        txt.setAcceptHoverEvents(False)
+                        txt.setAcceptedMouseButtons(Qt.NoButton)
+                        self._label_items.append(txt)
+                    angle = np.deg2rad(self.start_angle + (starts[j] + ends[j]) / 2)
+                    r = (inner + outer) / 2
+                    txt = self._label_items[placed]
+                    txt.setText(self.names[self._nodes[first + j]][:16])
+                    txt.setPos(r * np.cos(angle), -r * np.sin(angle))
+                    txt.show()
+                    placed += 1
+        for txt in self._label_items[placed:]:
+            txt.hide()
+        self._set_center_text(self.focus)
+
+    def _set_center_text(self, node):
+        self._center_label.setText("" if node <= 0 else f"{self.names[node][:16]}\n{self.value[node]:g}")
+        self._center_label.setVisible(self.donut_ratio > 0 and node > 0)
+
+    def paint(self, p, *args):
+        t0 = self.instrumentation.start()
+        p.setRenderHint(QPainter.Antialiasing)
+        p.setPen(self.border_pen)
+        for path, brush in zip(self._paths, self._brushes):
+            p.setBrush(brush)
+            p.drawPath(path)
+        if 0 <= self.hovered < len(self._paths):
+            p.setPen(self._hover_pen)
+            p.setBrush(self._brushes[self.hovered])
+            p.drawPath(self._paths[self.hovered])
+        self.instrumentation.stop('paintItem', t0)
+
+    def boundingRect(self):
+        r = self.radius + 10
+        return QRectF(-r, -r, 2 * r, 2 * r)
+
+    def segmentAt(self, x: float, y: float) -> int:
+        """Flat index of the drawn segment at (x, y) in item coordinates, -1 for none"""
+        t0 = self.instrumentation.start()
+        dist = np.hypot(x, y)
+        angle = (np.degrees(np.arctan2(-y, x)) - self.start_angle) % 360
+        index = -1
+        for inner, outer, starts, ends, first in self._rings:
+            if inner <= dist <= outer:
+                j = int(np.searchsorted(starts, angle, side='right')) - 1
+                if j >= 0 and angle < ends[j]:
+                    index = first + j
+                break
+        self.instrumentation.stop('hitTest', t0)
+        return index
+
+    def hoverEnterEvent(self, ev):
+        self._handle_hover(ev.pos())
+        ev.accept()
+
+    def hoverMoveEvent(self, ev):
+        self._handle_hover(ev.pos())
+        ev.accept()
+
+    def hoverLeaveEvent(self, ev):
+        self._handle_hover(None)
+        ev.accept()
+
+    def _handle_hover(self, pos):
+        index = -1 if pos is None else self.segmentAt(pos.x(), pos.y())
+        if index == self.hovered:
+            return
+        old = self.hovered
+        self.hovered = index
+        if old >= 0:
+            node = int(self._nodes[old])
+            self.sliceExited.emit(node, self.names[node])
+        if index >= 0:
+            node = int(self._nodes[index])
+            self.sliceHovered.emit(node, self.names[node], float(self.value[node]))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("HOVER IN → %s (%.1f)", self.names[node], self.value[node])
+        self._set_center_text(int(self._nodes[index]) if index >= 0 else self.focus)
+        self.update()
+
+    def mousePressEvent(self, ev):
+        index = self.segmentAt(ev.pos().x(), ev.pos().y())
+        if index >= 0:
+            node = int(self._nodes[index])
+            self.sliceClicked.emit(node, self.names[node], float(self.value[node]))
+        else:
+            self.backgroundClicked.emit()
+        ev.accept()
@@ -1,84 +1,193 @@
 import pyqtgraph as pg
+from pyqtgraph.Qt.QtCore import QRectF, QTimer, pyqtSignal
 from pyqtgraph.Qt.QtWidgets import QWidget, QVBoxLayout
 import numpy as np
-from datetime import datetime, timedelta
+from typing import Optional, Union
+from datetime import datetime, timezone
+from functools import lru_cache
 
 from ._style import style
+from ._instrument import Instrumentation, InstrumentedWidget
+from ._async import AsyncLoader
+from ._source.units import _UNIT_DIVISORS
+
+# with an EventSource, views with more visible events are always drawn as a density band, even without
+# `lod_threshold`, so at most about this many events (plus the cull margins) are read into memory
+_SOURCE_POINT_CAP = 1_000_000
+
+
+def _hash_uniform(values: np.ndarray) -> np.ndarray:
+    """Deterministic pseudo-random numbers in [0, 1) derived from the float64 bits of `values` (splitmix64)"""
+    z = np.ascontiguousarray(values, dtype=np.float64).view(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z ^= z >> np.uint64(31)
+    return (z >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+
+def _visible_alpha(visible: int) -> int:
+    """Point alpha for `visible` points on screen: opaque for a few points, fading as they pile up"""
+    # tune params
+    min_alpha = 20  # maximal allowed transparency
+    points_count_bound = 1000   # number of points for maximal transparency (== min_alpha)
+    exp = 4  # steepness
+    # --------------
+
+    if visible <= 1:
+        return 255
+    if visible >= points_count_bound:
+        return min_alpha
+    return int(((255.0 - min_alpha) / (points_count_bound ** exp)) * ((visible - points_count_bound) ** exp) + min_alpha)
+
+
+def _jitter(timestamps: np.ndarray, jitter: float, layout: str) -> np.ndarray:
+    """Initial y offsets: uniform random for 'random', derived from the timestamps otherwise"""
+    if layout == 'random':
+        return np.random.uniform(-jitter, jitter, size=len(timestamps))
+    return (2.0 * _hash_uniform(timestamps) - 1.0) * jitter
+
+
+def _stack_offsets(x: np.ndarray, width: float, dot: float, band: float) -> np.ndarray:
+    """
+    Dot-stack y offsets of sorted `x`: events are grouped into columns `width` wide (aligned to multiples of
+    `width`, so panning does not regroup them) and stacked 0, +1, -1, +2, ... dots of height `dot` around
+    the center. Columns too tall for +-`band` are squeezed to fit. O(n), no Python loop.
+    """
+    n = len(x)
+    if n == 0:
+        return np.empty(0, dtype=np.float64)
+    cols = np.floor(x / width)
+    starts = np.flatnonzero(np.concatenate(([True], cols[1:] != cols[:-1])))
+    counts = np.diff(np.append(starts, n))
+    rank = np.arange(n) - np.repeat(starts, counts)
+    slot = (rank + 1) // 2
+    step = np.minimum(dot, band / np.maximum(counts // 2, 1))
+    return np.where(rank % 2 == 1, 1.0, -1.0) * slot * np.repeat(step, counts)
+
+
+# "nice" fixed tick steps in seconds, from milliseconds up to weeks
+_FIXED_STEPS = np.array([
+    0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5,
+    1, 2, 5, 10, 15, 30,
+    60, 2 * 60, 5 * 60, 10 * 60, 15 * 60, 30 * 60,
+    3600, 2 * 3600, 3 * 3600, 6 * 3600, 12 * 3600,
+    86400, 2 * 86400, 7 * 86400,
+])
+# calendar steps in months, from one month up to a century
+_MONTH_STEPS = np.array([1, 2, 3, 6, 12, 24, 60, 120, 240, 600, 1200])
+_MONTH_SECONDS = 2629746  # average Gregorian month
+_WEEK_ORIGIN = 4 * 86400  # 1970-01-05 was a Monday
+_EPOCH_MONTHS = 1970 * 12  # months from year 0 to 1970, month steps are aligned to year 0 (round years)
+
+
+def _utc_offset(timestamp: float) -> float:
+    """Local time offset from UTC (seconds) at `timestamp`"""
+    try:
+        local = datetime.fromtimestamp(timestamp)
+        utc = datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+    except (ValueError, OverflowError, OSError):
+        return 0.0
+    return (local - utc).total_seconds()
+
+
+@lru_cache(maxsize=4096)
+def _format_tick(value: float, spacing: float) -> str:
+    try:
+        dt = datetime.fromtimestamp(value)
+    except (ValueError, OverflowError, OSError):
+        return ""
+    if spacing >= 365 * 86400:
+        return dt.strftime("%Y")
+    if spacing >= 28 * 86400:
+        return dt.strftime("%b %Y")
+    if spacing >= 86400:
+        return dt.strftime("%d.%m.%Y")
+    if spacing >= 3600:
+        return dt.strftime("%d.%m %H:%M")
+    if spacing >= 60:
+        return dt.strftime("%H:%M")
+    if spacing >= 1:
+        return dt.strftime("%H:%M:%S")
+    return dt.strftime("%H:%M:%S.") + f"{dt.microsecond // 1000:03d}"
 
 
 class DateAxisItem(pg.AxisItem):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, tick_spacing_px: float = 90, **kwargs):
         super().__init__(*args, **kwargs)
         self.setStyle(tickLength=8)
+        self.tick_spacing_px = tick_spacing_px  # minimal distance between two ticks
+        self._ticks_key = None
+        self._ticks = None
+        self.instrumentation = Instrumentation(self)  # replaced by the owning widget's one
 
     def tickValues(self, minVal, maxVal, size):
         """
-        Only "nice" timestamp ticks (multiples of 15 min, 1h, 1 day, etc.)
+        Only "nice" timestamp ticks in local time: milliseconds up to weeks on fixed steps,
+        calendar months and years above that. Ticks are generated as numpy arrays.
         """
-        min_dt = datetime.fromtimestamp(minVal)
-        max_dt = datetime.fromtimestamp(maxVal)
+        key = (minVal, maxVal, size)
+        if key == self._ticks_key:
+            return self._ticks
+        t0 = self.instrumentation.start()
 
         length_seconds = maxVal - minVal
-
-        if length_seconds > 3600 * 24 * 60:  # > 2 months
-            step = timedelta(days=30)
-        elif length_seconds > 3600 * 24 * 30:  # > 1 month
-            step = timedelta(days=7)
-        elif length_seconds > 3600 * 24 * 15:  # > 15 days
-            step = timedelta(days=2)
-        elif length_seconds > 3600 * 24 * 6:  # > 6 days
-            step = timedelta(days=1)
-        elif length_seconds > 3600 * 24:  # > 1 day
-            step = timedelta(hours=12)
-        elif length_seconds > 3600 * 12:  # > 12 hours
-            step = timedelta(hours=2)
-        elif length_seconds > 3600 * 6:  # > 6 hours
-            step = timedelta(hours=1)
-        elif length_seconds > 3600:  # > 1 hour
-            step = timedelta(minutes=15)
-        elif length_seconds > 600:  # > 10 min
-            step = timedelta(minutes=5)
+        if not np.isfinite(length_seconds) or length_seconds <= 0:
+            self._ticks_key, self._ticks = key, []
+            self.instrumentation.stop('ticks', t0)
+            return self._ticks
+        max_ticks = max(size / self.tick_spacing_px, 2.0)
+
+        offset = _utc_offset(minVal)
+        fits = _FIXED_STEPS[length_seconds / _FIXED_STEPS <= max_ticks]
+        if len(fits):
+            step = float(fits[0])
+            origin = _WEEK_ORIGIN if step == 7 * 86400 else 0.0
+            first = np.ceil((minVal + offset - origin) / step)
+            last = np.floor((maxVal + offset - origin) / step)
+            ticks = np.arange(first, last + 1) * step + origin - offset
+            spacing = step
         else:
-            step = timedelta(minutes=1)
-
-        step_seconds = step.total_seconds()
+            fits = _MONTH_STEPS[length_seconds / (_MONTH_STEPS * _MONTH_SECONDS) <= max_ticks]
+            months = int(fits[0] if len(fits) else _MONTH_STEPS[-1])
+            first = np.datetime64(int(np.floor(minVal + offset)), 's').astype('datetime64[M]').astype(np.int64)
+            last = np.datetime64(int(np.floor(maxVal + offset)), 's').astype('datetime64[M]').astype(np.int64)
+            first = -(-(first + _EPOCH_MONTHS) // months) * months - _EPOCH_MONTHS
+            starts = np.arange(first, last + 1, months).astype('datetime64[M]')
+            ticks = starts.astype('datetime64[s]').astype(np.int64).astype(np.float64) - offset
+            spacing = float(months * _MONTH_SECONDS)
+
+        if spacing >= 86400 and _utc_offset(maxVal) != offset:
+            # the range crosses a DST change, move ticks back onto local midnights; hourly ticks stay one hour
+            # apart in real time (no duplicated or skipped hour)
+            ticks = ticks + offset - np.array([_utc_offset(t) for t in ticks])
+        ticks = ticks[(ticks >= minVal) & (ticks <= maxVal)]
+
+        self._ticks_key = key
+        self._ticks = [(spacing, ticks)]
+        self.instrumentation.stop('ticks', t0)
+        return self._ticks
 
-        start_dt = min_dt - (min_dt - datetime(1970, 1, 1)) % step
-        if (min_dt - start_dt) % step != timedelta(0):
-            start_dt += step
+    def tickStrings(self, values, scale, spacing):
+        """Labels are cached per (timestamp, spacing), repaints during zoom reuse them"""
+        spacing = float(spacing)
+        return [_format_tick(float(v), spacing) for v in values]
 
-        ticks = []
-        current = start_dt
-        while current <= max_dt:
-            ticks.append(current.timestamp())
-            current += step
 
-        return [(step_seconds, ticks)]
+class TimeDistWidget(InstrumentedWidget, pg.PlotWidget):
+    dataReady = pyqtSignal()  # data passed to setDataAsync has been applied
+    sigSelectionChanged = pyqtSignal(object)  # (lo, hi) of the selected range or None, throttled
 
-    def tickStrings(self, values, scale, spacing):
-        strings = []
-        for v in values:
-            try:
-                dt = datetime.fromtimestamp(v)
-                if spacing >= 3600*24*30:
-                    s = dt.strftime("%b %Y")
-                elif spacing >= 3600*24:
-                    s = dt.strftime("%d.%m.%Y")
-                elif spacing >= 3600:
-                    s = dt.strftime("%d.%m %H:%M")
-                else:
-                    s = dt.strftime("%H:%M")
-                strings.append(s)
-            except ValueError:
-                strings.append("")
-        return strings
-
-
-class TimeDistWidget(pg.PlotWidget):
-
-    def __init__(self, parent=None, background=None, fixed_height=55, **kwargs):
+    def __init__(self, parent=None, background=None, fixed_height=55, lod_threshold: Optional[int] = 20000,
+                 max_age: Optional[float] = None, cull: Optional[bool] = None, cull_margin: float = 0.5,
+                 point_budget: Optional[int] = None, decimation: str = 'stride', alpha_levels: int = 16,
+                 update_interval: int = 16, layout: str = 'random', stack_threshold: float = 0.25,
+                 selection_interval: int = 50, **kwargs):
         super().__init__(parent=parent, background=background, axisItems={'bottom': DateAxisItem(orientation='bottom')}, **kwargs)
 
+        # opt-in timings of setData/appendData, view changes, density updates, ticks and paint, see stats()
+        self.instrumentation = Instrumentation(self)
+        self.getAxis('bottom').instrumentation = self.instrumentation
+
         self.hideAxis('left')
         self.hideAxis('right')
         self.hideAxis('top')
@@ -96,44 +205,657 @@ class TimeDistWidget(pg.PlotWidget):
 
         pc = style.primary_color.getRgb()
 
-        self.scatter = pg.ScatterPlotItem(size=9, pen=None, brush=pg.mkBrush(pc[0], pc[1], pc[2], 35))
+        self.scatter = pg.ScatterPlotItem(size=9, pen=None, brush=style.brush((pc[0], pc[1], pc[2], 35)))
         self.addItem(self.scatter)
 
+        # category mode (setData(..., categories=codes)): one scatter per category instead of per-point brushes,
+        # all filled from the same sorted buffers; colors follow the style palette unless set by setCategoryColors
+        self.category_colors = None
+        self._category_scatters = []
+        self._category_rgb = []
+        self._category_levels = []
+        self._category_index = None  # (order, bounds, timestamps) of the buffer grouped by category, on demand
+
+        # level-of-detail: above `lod_threshold` visible points a binned density band is drawn instead of dots
+        self.lod_threshold = lod_threshold
+        self.density = pg.ImageItem(axisOrder='row-major')
+        self.density.setLookupTable(self._density_lut(pc))
+
+        # the density alpha is quantized to `alpha_levels` steps, one cached brush per step
+        self._color = pc
+        self.alpha_levels = max(int(alpha_levels), 2)
+        self._brushes = {}
+        self._alpha_level = None
+        self.density.hide()
+        self.addItem(self.density)
+
+        # culling: the scatter only holds the visible slice (plus `cull_margin` view widths on both sides),
+        # thinned out by `decimation` ('stride' or 'random') to at most `point_budget` points. On by default
+        # with LOD: the scatter is then only loaded once at most `lod_threshold` events are in view, so the
+        # cost of setData and of a frame does not grow with the amount of data
+        if decimation not in ('stride', 'random'):
+            raise ValueError(f"Unknown decimation '{decimation}', expected 'stride' or 'random'")
+        self.cull = cull if cull is not None else lod_threshold is not None
+        self.cull_margin = cull_margin
+        self.point_budget = point_budget
+        self.decimation = decimation
+        self._culled = None  # (lo, hi, view width, decimated) of the slice currently in the scatter
+        self._drawn_ratio = 1.0
+
+        # vertical placement: 'random' jitter, deterministic 'hash' jitter (appends and reloads keep every dot
+        # where it was) or 'stack' - non-overlapping dot stacks at the current zoom, recomputed only once the
+        # zoom changes by more than `stack_threshold` (relative)
+        if layout not in ('random', 'hash', 'stack'):
+            raise ValueError(f"Unknown layout '{layout}', expected 'random', 'hash' or 'stack'")
+        self.layout = layout
+        self.stack_threshold = stack_threshold
+        self._stack_level = None  # quantized column width the stacks were computed for
         self.jitter = 0.35
+        self.max_age = max_age  # seconds of history kept by appendData, None keeps everything
+        # with an EventSource only the slice around the view is loaded into the buffers, see setSource
+        self._source = None
+        self._source_range = None
+        self._set_buffers(np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64))
 
         self.setFixedHeight(fixed_height)
         self.setMinimumHeight(fixed_height)
         self.setMaximumHeight(fixed_height)
 
+        # range changes are coalesced into at most one update per `update_interval` ms (one frame at 60 Hz)
+        self._view_timer = QTimer(self)
+        self._view_timer.setSingleShot(True)
+        self._view_timer.setInterval(update_interval)
+        self._view_timer.timeout.connect(self._on_view_changed)
+
         view = self.plotItem.vb
-        view.sigRangeChanged.connect(self._on_view_changed)
+        view.sigRangeChanged.connect(self._schedule_view_update)
+
+        # brushed selection, created by setSelection; dragging emits sigSelectionChanged at most once per
+        # `selection_interval` ms
+        self.region = None
+        self._selection_timer = QTimer(self)
+        self._selection_timer.setSingleShot(True)
+        self._selection_timer.setInterval(selection_interval)
+        self._selection_timer.timeout.connect(self._emit_selection)
+
+        self._loader = AsyncLoader(self)
+        self._loader.ready.connect(self._apply_prepared)
+
+        style.changed.connect(self._apply_style)
+
+    def _apply_style(self):
+        """Follow a changed primary color in place: new LUT, brushes picked again on the next view update"""
+        pc = style.primary_color.getRgb()
+        recolor = self.categories is not None and self.category_colors is None
+        if pc == self._color and not recolor:
+            return
+        self._color = pc
+        if recolor:
+            self._category_rgb = self._category_palette(len(self._category_rgb))
+        self._brushes = {}
+        self._alpha_level = None
+        self._category_levels = [None] * len(self._category_rgb)
+        if self.categories is None:
+            self.density.setLookupTable(self._density_lut(pc))
+        self._on_view_changed()
+
+    def _schedule_view_update(self, *args):
+        if not self._view_timer.isActive():
+            self._view_timer.start()
+
+    def setSelection(self, lo: float, hi: float):
+        """Select [lo, hi] (seconds since epoch or datetimes) with a draggable region"""
+        if isinstance(lo, datetime):
+            lo = lo.timestamp()
+        if isinstance(hi, datetime):
+            hi = hi.timestamp()
+        if self.region is None:
+            c = style.secondary_color
+            self.region = pg.LinearRegionItem(values=(lo, hi), orientation='vertical',
+                                              brush=style.brush((c.red(), c.green(), c.blue(), 50)))
+            self.region.setZValue(10)
+            self.region.sigRegionChanged.connect(self._schedule_selection)
+            self.addItem(self.region)
+        else:
+            self.region.setRegion((lo, hi))
+        self._schedule_selection()
+
+    def clearSelection(self):
+        if self.region is None:
+            return
+        self.removeItem(self.region)
+        self.region = None
+        self._schedule_selection()
+
+    def selection(self) -> Optional[tuple[float, float]]:
+        """(lo, hi) of the selected range, None without a selection"""
+        if self.region is None:
+            return None
+        lo, hi = self.region.getRegion()
+        return float(lo), float(hi)
+
+    def _schedule_selection(self, *args):
+        if not self._selection_timer.isActive():
+            self._selection_timer.start()
+
+    def _emit_selection(self):
+        self.sigSelectionChanged.emit(self.selection())
+
+    def rangeIndices(self, lo: float, hi: float) -> tuple[int, int]:
+        """Index range [left, right) of the events in [lo, hi] (indices into the data or the EventSource)"""
+        if self._source is not None:
+            return self._source.indices(lo, hi)
+        return (int(np.searchsorted(self.timestamps, lo, side='left')),
+                int(np.searchsorted(self.timestamps, hi, side='right')))
+
+    def rangeStats(self, lo: Optional[float] = None, hi: Optional[float] = None) -> dict:
+        """
+        Count, index range, first/last event and mean rate (events per second) of [lo, hi], the current
+        selection by default. Two binary searches on the sorted timestamps - their indices are the prefix
+        counts - so O(log n) regardless of the amount of data.
+        """
+        if lo is None or hi is None:
+            lo, hi = self.selection() or (np.nan, np.nan)
+        left, right = self.rangeIndices(lo, hi) if hi >= lo else (0, 0)
+        count = right - left
+        first = last = None
+        if count:
+            time = self._source.time if self._source is not None else lambda i: float(self.timestamps[i])
+            first, last = time(left), time(right - 1)
+        duration = hi - lo if hi >= lo else 0.0
+        return {
+            'lo': lo, 'hi': hi, 'count': count, 'left': left, 'right': right,
+            'first': first, 'last': last, 'duration': duration,
+            'rate': count / duration if duration > 0 else float('nan'),
+        }
+
+    def rangeHistogram(self, lo: Optional[float] = None, hi: Optional[float] = None,
+                       bins: int = 100) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (edges, counts, rates per second) of `bins` equal buckets over [lo, hi], the selection by default.
+        Counts are exact, `bins + 1` binary searches (also on an EventSource, whose count pyramid is for drawing).
+        """
+        if lo is None or hi is None:
+            lo, hi = self.selection() or (0.0, 0.0)
+        edges = np.linspace(lo, hi, max(int(bins), 1) + 1)
+        if self._source is not None:
+            counts = self._source.exact_counts(edges)  # the count pyramid is only good enough for drawing
+        else:
+            counts = np.diff(np.searchsorted(self.timestamps, edges, side='left'))
+        width = (hi - lo) / max(int(bins), 1)
+        rates = counts / width if width > 0 else np.full(len(counts), np.nan)
+        return edges, counts, rates
+
+    def setLayout(self, layout: str):
+        """Switch the vertical placement of dots: 'random', 'hash' or 'stack' (see __init__)"""
+        if layout not in ('random', 'hash', 'stack'):
+            raise ValueError(f"Unknown layout '{layout}', expected 'random', 'hash' or 'stack'")
+        self.layout = layout
+        self._stack_level = None
+        if layout != 'stack':
+            self._y[:] = _jitter(self.timestamps, self.jitter, layout)
+            self._refresh_points()
+        self._on_view_changed()
+
+    def _update_stack(self, xmin, xmax):
+        """Recompute the dot stacks when the zoom left the quantization step they were computed for"""
+        vb = self.plotItem.vb
+        if len(self.timestamps) == 0 or vb.width() <= 0 or vb.height() <= 0:
+            return
+        dot_px = self.scatter.opts['size']
+        width = dot_px * (xmax - xmin) / vb.width()  # seconds covered by one dot
+        step = np.log1p(self.stack_threshold)
+        level = int(np.round(np.log(width) / step))
+        if level == self._stack_level:
+            return
+        ymin, ymax = self.viewRange()[1]
+        self._stack_level = level
+        self._stack_width = float(np.exp(level * step))
+        self._stack_dot = dot_px * (ymax - ymin) / vb.height()
+        self.instrumentation.count('restacks')
+        self._restack(0)
+        self._refresh_points()
+
+    def _restack(self, index: int):
+        """Stack offsets of all events from the column containing `index` on"""
+        x = self.timestamps
+        if index >= len(x):
+            return
+        width = self._stack_width
+        if index > 0:
+            index = np.searchsorted(x, np.floor(x[index] / width) * width, side='left')
+        self._y[index:] = _stack_offsets(x[index:], width, self._stack_dot, self.jitter)
+
+    def _pending_work(self):
+        return [(self._view_timer, self._on_view_changed)]
+
+    def setData(self, values: Union[list[datetime], np.ndarray], unit: str = 's', assume_sorted: bool = False,
+                categories: Optional[np.ndarray] = None):
+        """
+        Accepts a list of datetimes, a numpy datetime64 array or epoch numbers in `unit` ('s', 'ms', 'us', 'ns')
+        given as an array or any buffer-protocol object. Sorted float64 seconds are used without copying;
+        `assume_sorted` skips the sortedness check as well.
 
-    def setData(self, values: list[datetime]):
-        if not values:
+        `categories` - one non-negative integer code per event (e.g. severity) - colors events by category:
+        category k is drawn in `category_colors[k]` (the style palette by default) with its own density alpha.
+        """
+        t0 = self.instrumentation.start()
+        self._loader.cancel()
+        self._source = None
+        if values is None or len(values) == 0:
+            self._set_buffers(np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64))
+            self._configure_categories(0)
+            self._clear_points()
+            self.density.hide()
+            self.scatter.show()
+        else:
+            prepared = self._prepare_data(values, unit, assume_sorted, self.jitter, self.layout, categories)
+            self._apply_prepared(prepared, emit=False)
+        self.instrumentation.stop('setData', t0)
+
+    def setDataAsync(self, values: Union[list[datetime], np.ndarray], unit: str = 's', assume_sorted: bool = False,
+                     categories: Optional[np.ndarray] = None):
+        """
+        `setData` with the conversion, sorting and jitter generation done on a QThreadPool worker; only the
+        result is applied in the GUI thread, followed by `dataReady`. A newer setData/setDataAsync call
+        cancels a pending one. With `cull` (the default with LOD) applying does not push every point to the
+        scatter either. appendData/dropBefore calls made while the result is pending are applied after it.
+        """
+        if values is None or len(values) == 0:
+            self.setData(values)
+            self.dataReady.emit()
+            return
+        self._loader.submit(self._prepare_data, values, unit, assume_sorted, self.jitter, self.layout, categories)
+
+    def setCategoryColors(self, colors: Optional[list] = None):
+        """Colors of the categories (cycled if there are fewer colors than categories), None follows the style"""
+        self.category_colors = list(colors) if colors is not None else None
+        self._category_rgb = self._category_palette(len(self._category_rgb))
+        self._brushes = {}
+        self._category_levels = [None] * len(self._category_rgb)
+        self._on_view_changed()
+
+    def _category_palette(self, count: int) -> list:
+        colors = self.category_colors if self.category_colors else style.colors(count) if count else []
+        return [pg.mkColor(colors[k % len(colors)]).getRgb() for k in range(count)]
+
+    def _configure_categories(self, count: int):
+        """Draw with one scatter per category (`count` > 0) or with the single scatter (0)"""
+        while len(self._category_scatters) < count:
+            scatter = pg.ScatterPlotItem(size=self.scatter.opts['size'], pen=None)
+            self.addItem(scatter)
+            self._category_scatters.append(scatter)
+        points_visible = not self.density.isVisible()
+        for k, scatter in enumerate(self._category_scatters):
+            if k >= count:
+                scatter.clear()
+            scatter.setVisible(k < count and points_visible)
+        if count:
             self.scatter.clear()
+        self.scatter.setVisible(not count and points_visible)
+        if count != len(self._category_rgb):
+            self._category_rgb = self._category_palette(count)
+            self._category_levels = [None] * count
+        self._alpha_level = None
+
+    def _point_items(self) -> list:
+        """The scatter(s) currently drawing the events"""
+        if self.categories is None:
+            return [self.scatter]
+        return self._category_scatters[:len(self._category_rgb)]
+
+    def _set_points_visible(self, visible: bool):
+        for scatter in self._point_items():
+            scatter.setVisible(visible)
+
+    def _clear_points(self):
+        self.scatter.clear()
+        for scatter in self._category_scatters:
+            scatter.clear()
+
+    def _category_groups(self):
+        """
+        (order, bounds, timestamps) of the buffer grouped by category: `timestamps[bounds[k]:bounds[k + 1]]` are
+        the sorted events of category k, `order` maps them back into the buffer. A stable counting sort of the
+        small integer codes, O(n); cached until the buffer changes.
+        """
+        if self._category_index is None:
+            order, bounds = self._group(self.categories, len(self._category_rgb))
+            self._category_index = order, bounds, self.timestamps[order]
+        return self._category_index
+
+    @staticmethod
+    def _group(codes: np.ndarray, count: int):
+        order = np.argsort(codes, kind='stable')
+        bounds = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=count), out=bounds[1:])
+        return order, bounds
+
+    def _set_points(self, x: np.ndarray, y: np.ndarray, codes: Optional[np.ndarray]):
+        """Hand points to the scatter(s), split by category in category mode"""
+        if codes is None:
+            self.scatter.setData(x=x, y=y)
             return
+        if codes is self.categories:
+            order, bounds, xs = self._category_groups()
+        else:
+            order, bounds = self._group(codes, len(self._category_rgb))
+            xs = x[order]
+        ys = y[order]
+        for k, scatter in enumerate(self._point_items()):
+            scatter.setData(x=xs[bounds[k]:bounds[k + 1]], y=ys[bounds[k]:bounds[k + 1]])
 
-        self.timestamps = np.array([dt.timestamp() for dt in values], dtype=np.float64)
-        self.timestamps.sort()
-        if len(self.timestamps) == 1:
-            center = self.timestamps[0]
+    def setSource(self, source):
+        """
+        Show the events of an `EventSource` (e.g. a `MemmapEventSource` over a file larger than RAM) instead of
+        in-memory data. Zoomed-out views are drawn from the source's binned counts; once at most `lod_threshold`
+        events (never more than `_SOURCE_POINT_CAP`) are visible, only those (plus `cull_margin` view widths on
+        both sides) are loaded as points, with jitter derived from the timestamps so reloaded points do not move.
+        """
+        self._loader.cancel()
+        self._source = source
+        self._source_range = None
+        self._set_buffers(np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64))
+        self._configure_categories(0)
+        self._clear_points()
+        if source is None or len(source) == 0:
+            self._source = None
+            self.density.hide()
+            self.scatter.show()
+            return
+        self._culled = None
+        self._update_limits()
+        self.setXRange(self._data_xmin, self._data_xmax, padding=0.02)
+        self._on_view_changed()
+
+    def _load_source_slice(self, xmin, xmax):
+        """Load the events around [xmin, xmax] from the source unless the loaded slice still covers the view"""
+        if self._source_range is not None:
+            lo, hi = self._source_range
+            if lo <= xmin and xmax <= hi:
+                return
+        width = xmax - xmin
+        lo = xmin - width * self.cull_margin
+        hi = xmax + width * self.cull_margin
+        x = self._source.slice(lo, hi)
+        self._set_buffers(x, _jitter(x, self.jitter, 'hash' if self.layout == 'random' else self.layout))
+        self._stack_level = None
+        self._source_range = (lo, hi)
+        self.instrumentation.count('sourceLoads')
+        self._refresh_points()
+
+    @classmethod
+    def _prepare_data(cls, values, unit, assume_sorted, jitter, layout='random', categories=None,
+                      cancelled=lambda: False):
+        """Sorted float64 timestamps, their jitter and category codes; no Qt objects are touched, safe on any thread"""
+        timestamps = cls._to_timestamps(values, unit)
+        codes = cls._to_codes(categories, len(timestamps)) if categories is not None else None
+        timestamps, codes = cls._sorted_events(timestamps, values, assume_sorted, codes)
+        if cancelled():
+            return None
+        return timestamps, _jitter(timestamps, jitter, layout), codes
+
+    def _apply_prepared(self, prepared, emit=True):
+        t0 = self.instrumentation.start()
+        timestamps, y, codes = prepared
+        self._source = None
+        self._set_buffers(timestamps, y, codes)
+        self._configure_categories(int(codes.max()) + 1 if codes is not None and len(codes) else 0)
+        self._stack_level = None
+        self._after_data_changed(reset_view=True)
+        self.instrumentation.stop('applyData', t0)
+        if emit:
+            self.dataReady.emit()
+
+    def appendData(self, values: Union[list[datetime], np.ndarray], follow: bool = False, unit: str = 's',
+                   assume_sorted: bool = False, categories: Optional[np.ndarray] = None):
+        """
+        Merge new events into the already sorted data. Only the batch is sorted and only the part of the buffer
+        newer than the oldest new event is shifted, so in-order batches cost O(batch). Existing points keep
+        their jitter and the view stays where it is, unless `follow` is set - then it scrolls to the newest event.
+        Accepts the same inputs as `setData`; `categories` must be given if and only if the data has categories.
+        """
+        if self._source is not None:
+            raise RuntimeError("appendData is not supported while an EventSource is shown, use setData first")
+        if self._loader.defer(self.appendData, values, follow, unit, assume_sorted, categories):
+            return  # appended to the data of the pending setDataAsync once it is applied
+        new = self._to_timestamps(values, unit)
+        k = len(new)
+        if k == 0:
+            return
+        t0 = self.instrumentation.start()
+        was_empty = len(self.timestamps) == 0
+        codes = self._to_codes(categories, k) if categories is not None else None
+        if was_empty and (codes is None) != (self.categories is None):
+            self._set_buffers(np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64),
+                              np.empty(0, dtype=np.int16) if codes is not None else None)
+            self._configure_categories(0)  # back to the single scatter, categories are configured below
+        elif (codes is None) != (self.categories is None):
+            raise ValueError("appendData needs categories exactly when the data shown has categories")
+
+        new, codes = self._sorted_events(new, values, assume_sorted, codes)
+        new_y = _jitter(new, self.jitter, self.layout)
+        self._reserve(k)
+
+        pos = self._start + np.searchsorted(self.timestamps, new[0], side='right')
+        end = self._end
+        if pos == end:
+            self._buf_x[end:end + k] = new
+            self._buf_y[end:end + k] = new_y
+            if codes is not None:
+                self._buf_c[end:end + k] = codes
+        else:
+            tail_x = self._buf_x[pos:end]
+            at = np.searchsorted(tail_x, new, side='right')
+            merged_y = np.insert(self._buf_y[pos:end], at, new_y)
+            if codes is not None:
+                self._buf_c[pos:end + k] = np.insert(self._buf_c[pos:end], at, codes)
+            self._buf_x[pos:end + k] = np.insert(tail_x, at, new)
+            self._buf_y[pos:end + k] = merged_y
+        self._end += k
+        self._sync_views()
+        if codes is not None:
+            self._configure_categories(max(len(self._category_rgb), int(codes.max()) + 1))
+        if self._stack_level is not None:
+            self._restack(pos - self._start)  # stacks left of the first new event are unchanged
+
+        if self.max_age is not None:
+            self._start += np.searchsorted(self.timestamps, self.timestamps[-1] - self.max_age, side='left')
+            self._sync_views()
+
+        self._after_data_changed(reset_view=was_empty, follow=follow)
+        self.instrumentation.stop('appendData', t0)
+        self.instrumentation.count('appended', k)
+
+    def dropBefore(self, timestamp: float):
+        """Forget all events older than `timestamp` (seconds since epoch). O(log n), nothing is copied."""
+        if self._source is not None:
+            raise RuntimeError("dropBefore is not supported while an EventSource is shown, use setData first")
+        if self._loader.defer(self.dropBefore, timestamp):
+            return
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.timestamp()
+        idx = np.searchsorted(self.timestamps, timestamp, side='left')
+        if idx == 0:
+            return
+        self._start += idx
+        self._sync_views()
+        self._after_data_changed()
+
+    def _after_data_changed(self, reset_view=False, follow=False):
+        if self.region is not None:
+            self._schedule_selection()  # same range, different answers
+        if len(self.timestamps) == 0:
+            self._clear_points()
+            self.density.hide()
+            return
+        self._refresh_points()
+        self._update_limits()
+        if reset_view:
+            self.setXRange(self._data_xmin, self._data_xmax, padding=0.02)
+        elif follow:
+            xmin, xmax = self.viewRange()[0]
+            newest = self.timestamps[-1]
+            width = xmax - xmin
+            if newest > xmax - width * 0.02:
+                self.setXRange(newest - width * 0.98, newest + width * 0.02, padding=0)
+        self._on_view_changed()
+
+    @staticmethod
+    def _to_timestamps(values, unit: str = 's') -> np.ndarray:
+        """Float64 seconds since epoch; a view of `values` whenever no conversion is needed"""
+        if isinstance(values, (list, tuple)) and len(values) and isinstance(values[0], datetime):
+            return np.array([dt.timestamp() for dt in values], dtype=np.float64)
+
+        arr = np.asarray(values).reshape(-1)
+        if arr.dtype.kind == 'O':
+            return np.array([dt.timestamp() for dt in arr], dtype=np.float64)
+        if arr.dtype.kind == 'M':
+            unit = np.datetime_data(arr.dtype)[0]
+            if unit not in _UNIT_DIVISORS:
+                arr = arr.astype('datetime64[ns]')
+                unit = 'ns'
+            arr = arr.view(np.int64)
+        elif unit not in _UNIT_DIVISORS:
+            raise ValueError(f"Unknown time unit '{unit}', expected one of {list(_UNIT_DIVISORS)}")
+
+        if unit == 's':
+            return arr.astype(np.float64, copy=False)
+        timestamps = arr.astype(np.float64)
+        timestamps /= _UNIT_DIVISORS[unit]
+        return timestamps
+
+    @staticmethod
+    def _to_codes(categories, count: int) -> np.ndarray:
+        """Category codes as a new int16 array (sorting never touches caller-owned memory)"""
+        codes = np.asarray(categories).reshape(-1)
+        if len(codes) != count:
+            raise ValueError(f"Got {len(codes)} categories for {count} events")
+        if count and (codes.dtype.kind not in 'iu' or codes.min() < 0 or codes.max() > np.iinfo(np.int16).max):
+            raise ValueError("Categories must be integer codes in [0, 32767]")
+        return codes.astype(np.int16)
+
+    @classmethod
+    def _sorted_events(cls, timestamps: np.ndarray, values, assume_sorted: bool, codes: Optional[np.ndarray]):
+        """`_sorted` keeping category codes aligned with their events"""
+        if codes is None or assume_sorted or len(timestamps) < 2 or np.all(timestamps[1:] >= timestamps[:-1]):
+            return cls._sorted(timestamps, values, assume_sorted), codes
+        order = np.argsort(timestamps, kind='stable')
+        return timestamps[order], codes[order]
+
+    @staticmethod
+    def _sorted(timestamps: np.ndarray, values, assume_sorted: bool) -> np.ndarray:
+        """Sorted `timestamps`, never sorting caller-owned memory in place"""
+        if assume_sorted or len(timestamps) < 2 or np.all(timestamps[1:] >= timestamps[:-1]):
+            return timestamps
+        if timestamps.flags.owndata and timestamps is not values:
+            timestamps.sort()
+            return timestamps
+        return np.sort(timestamps)
+
+    def _set_buffers(self, x: np.ndarray, y: np.ndarray, c: Optional[np.ndarray] = None):
+        """`self.timestamps`, `self._y` and `self.categories` are views of [start:end) of growable buffers"""
+        self._buf_x = x
+        self._buf_y = y
+        self._buf_c = c
+        self._start = 0
+        self._end = len(x)
+        self._sync_views()
+
+    def _sync_views(self):
+        self.timestamps = self._buf_x[self._start:self._end]
+        self._y = self._buf_y[self._start:self._end]
+        self.categories = self._buf_c[self._start:self._end] if self._buf_c is not None else None
+        self._category_index = None
+
+    def _reserve(self, k: int):
+        """Make room for `k` more events at the end, compacting out dropped events when reallocating"""
+        if self._end + k <= len(self._buf_x):
+            return
+        n = self._end - self._start
+        capacity = max(2 * (n + k), 1024)
+        buf_x = np.empty(capacity, dtype=np.float64)
+        buf_y = np.empty(capacity, dtype=np.float64)
+        buf_x[:n] = self.timestamps
+        buf_y[:n] = self._y
+        if self._buf_c is not None:
+            buf_c = np.empty(capacity, dtype=np.int16)
+            buf_c[:n] = self.categories
+            self._buf_c = buf_c
+        self._buf_x, self._buf_y = buf_x, buf_y
+        self._start, self._end = 0, n
+        self._sync_views()
+
+    def _refresh_points(self):
+        if self.cull or self.point_budget is not None:
+            self._culled = None  # reloaded by the next _on_view_changed
+            return
+        self._set_points(self.timestamps, self._y, self.categories)
+
+    def _update_culled_points(self, xmin, xmax):
+        width = xmax - xmin
+        if self._culled is not None:
+            if not self.cull:
+                return  # decimated once over the whole data
+            lo, hi, loaded_width, decimated = self._culled
+            # still inside the loaded slice and not zoomed in far enough for a finer decimation to matter
+            if lo <= xmin and xmax <= hi and (not decimated or width > loaded_width * 0.5):
+                return
+
+        if self.cull:
+            lo = xmin - width * self.cull_margin
+            hi = xmax + width * self.cull_margin
+            left = np.searchsorted(self.timestamps, lo, side='left')
+            right = np.searchsorted(self.timestamps, hi, side='right')
+        else:
+            lo, hi = -np.inf, np.inf
+            left, right = 0, len(self.timestamps)
+
+        self.instrumentation.count('cullReloads')
+        x, y, codes = self._decimate(left, right)
+        self._drawn_ratio = len(x) / max(right - left, 1)
+        self._set_points(x, y, codes)
+        self._culled = (lo, hi, width, len(x) < right - left)
+
+    def _decimate(self, left, right):
+        """
+        Points [left:right) (x, y, category codes or None) reduced to at most `point_budget`, choosing the same
+        points on every call
+        """
+        count = right - left
+        codes = self.categories
+        if self.point_budget is None or count <= self.point_budget:
+            return self.timestamps[left:right], self._y[left:right], codes[left:right] if codes is not None else None
+
+        if self.decimation == 'stride':
+            stride = -(-count // self.point_budget)
+            start = left + (-left) % stride  # aligned to absolute indices, panning keeps the same points
+            picked = slice(start, right, stride)
+            return self.timestamps[picked], self._y[picked], codes[picked] if codes is not None else None
+
+        x = self.timestamps[left:right]
+        keep = _hash_uniform(x) < self.point_budget / count
+        return x[keep], self._y[left:right][keep], codes[left:right][keep] if codes is not None else None
+
+    def _update_limits(self):
+        if self._source is not None:
+            n, first, last = len(self._source), self._source.first, self._source.last
+        else:
+            n, first, last = len(self.timestamps), self.timestamps[0], self.timestamps[-1]
+        if n == 1:
+            center = first
             padding = 86400 * 5
             self._data_xmin = center - padding
             self._data_xmax = center + padding
         else:
-            self._data_xmin = self.timestamps.min()
-            self._data_xmax = self.timestamps.max()
+            self._data_xmin = first
+            self._data_xmax = last
 
         data_span = self._data_xmax - self._data_xmin
         tolerance = data_span * 0.05
         limit_min = self._data_xmin - tolerance
         limit_max = self._data_xmax + tolerance
 
-        y = np.random.uniform(-self.jitter, self.jitter, size=len(self.timestamps))
-        self.scatter.setData(x=self.timestamps, y=y)
-
-        self.setXRange(self._data_xmin, self._data_xmax, padding=0.02)
-
         self.setLimits(
             xMin=limit_min,
             xMax=limit_max,
@@ -142,29 +864,113 @@ class TimeDistWidget(pg.PlotWidget):
         )
 
     def _on_view_changed(self):
-        """Called automatically on every zoom/pan"""
-        if len(self.timestamps) == 0:
-            visible = 0
+        """Called automatically on every zoom/pan (coalesced, see _schedule_view_update)"""
+        t0 = self.instrumentation.start()
+        self._update_view()
+        self.instrumentation.stop('viewChange', t0)
+
+    def _update_view(self):
+        if self._source is not None:
+            xmin, xmax = self.viewRange()[0]
+            visible = self._source.count(xmin, xmax)
+        elif len(self.timestamps) == 0:
+            visible = left_idx = right_idx = 0
         else:
             xmin, xmax = self.viewRange()[0]
             left_idx = np.searchsorted(self.timestamps, xmin, side='left')
             right_idx = np.searchsorted(self.timestamps, xmax, side='right')
             visible = right_idx - left_idx
 
-        # tune params
-        min_alpha = 20  # maximal allowed transparency
-        points_count_bound = 1000   # number of points for maximal transparency (== min_alpha)
-        exp = 4  # steepness
-        # --------------
+        threshold = self.lod_threshold
+        if self._source is not None:
+            threshold = min(threshold, _SOURCE_POINT_CAP) if threshold is not None else _SOURCE_POINT_CAP
+        if threshold is not None and visible > threshold:
+            self._update_density(xmin, xmax)
+            return
+        if self.density.isVisible():
+            self.density.hide()
+            self._set_points_visible(True)
+        if self._source is not None:
+            self._load_source_slice(xmin, xmax)
+        if self.layout == 'stack':
+            self._update_stack(xmin, xmax)
+        if len(self.timestamps) and (self.cull or self.point_budget is not None):
+            self._update_culled_points(xmin, xmax)
+            visible = int(visible * self._drawn_ratio)  # the alpha follows what is actually drawn
+
+        if self.categories is not None:
+            # every category fades with its own visible count
+            counts = np.bincount(self.categories[left_idx:right_idx], minlength=len(self._category_rgb))
+            for k, scatter in enumerate(self._point_items()):
+                level = round(_visible_alpha(int(counts[k] * self._drawn_ratio)) * (self.alpha_levels - 1) / 255.0)
+                if level != self._category_levels[k]:
+                    self._category_levels[k] = level
+                    scatter.setBrush(self._level_brush(level, k))
+            return
 
-        if visible <= 1:
-            alpha = 255
-        elif visible >= points_count_bound:
-            alpha = min_alpha
+        level = round(_visible_alpha(visible) * (self.alpha_levels - 1) / 255.0)
+        if level != self._alpha_level:
+            self._alpha_level = level
+            self.scatter.setBrush(self._level_brush(level))
+
+    def _level_brush(self, level: int, category: Optional[int] = None):
+        key = level if category is None else (category, level)
+        brush = self._brushes.get(key)
+        if brush is None:
+            color = self._color if category is None else self._category_rgb[category]
+            alpha = max(int(round(level * 255.0 / (self.alpha_levels - 1))), 1)
+            brush = style.brush((color[0], color[1], color[2], alpha))
+            self._brushes[key] = brush
+        return brush
+
+    @staticmethod
+    def _density_lut(color):
+        """Lookup table fading from transparent to `color` (r, g, b, ...)"""
+        lut = np.empty((256, 4), dtype=np.ubyte)
+        lut[:, :3] = color[:3]
+        lut[:, 3] = np.linspace(0, 255, 256)
+        return lut
+
+    def _update_density(self, xmin, xmax):
+        """Draw visible events as a heat band with one bin per horizontal pixel"""
+        self.instrumentation.count('densityUpdates')
+        bins = max(int(self.plotItem.vb.width()), 1)
+        edges = np.linspace(xmin, xmax, bins + 1)
+        if self.categories is not None:
+            self._update_category_density(xmin, xmax, edges)
+            return
+        if self.density.lut is None:
+            self.density.setLookupTable(self._density_lut(self._color))
+        # counts per bin straight from the sorted array: O(bins * log n), independent of the visible count
+        if self._source is not None:
+            counts = self._source.counts(edges)
         else:
-            alpha = int(((255.0 - min_alpha) / (points_count_bound ** exp)) * ((visible - points_count_bound) ** exp) + min_alpha)
-
-        current_color = self.scatter.opts['brush'].color()
-        current_color.setAlpha(alpha)
-        new_brush = pg.mkBrush(current_color)
-        self.scatter.setBrush(new_brush)
+            counts = np.diff(np.searchsorted(self.timestamps, edges, side='left'))
+        img = np.log1p(counts.astype(np.float64))[np.newaxis, :]
+
+        self.density.setImage(img, levels=(0.0, max(float(img.max()), 1.0)), autoLevels=False)
+        self._show_density(xmin, xmax)
+
+    def _update_category_density(self, xmin, xmax, edges):
+        """One band row per category, colored by category, alpha from its own counts per bin"""
+        _, bounds, xs = self._category_groups()
+        count = len(self._category_rgb)
+        counts = np.empty((count, len(edges) - 1), dtype=np.int64)
+        for k in range(count):
+            counts[k] = np.diff(np.searchsorted(xs[bounds[k]:bounds[k + 1]], edges, side='left'))
+        level = np.log1p(counts.astype(np.float64))
+        level /= max(float(level.max()), 1.0)
+
+        img = np.empty((count, len(edges) - 1, 4), dtype=np.ubyte)
+        img[..., :3] = np.array([c[:3] for c in self._category_rgb], dtype=np.ubyte)[:, None, :]
+        img[..., 3] = (level * 255).astype(np.ubyte)
+        if self.density.lut is not None:
+            self.density.setLookupTable(None, update=False)
+        self.density.setImage(img, levels=None, autoLevels=False)
+        self._show_density(xmin, xmax)
+
+    def _show_density(self, xmin, xmax):
+        self.density.setRect(QRectF(xmin, -self.jitter, xmax - xmin, 2 * self.jitter))
+        if not self.density.isVisible():
+            self._set_points_visible(False)
+            self.density.show()
@@ -0,0 +1,221 @@
+import pyqtgraph as pg
+from pyqtgraph.Qt.QtCore import QRectF, QTimer
+import numpy as np
+from typing import Optional, Union
+
+from ._style import style
+from ._instrument import Instrumentation, InstrumentedWidget
+from ._TimeDistWidget import TimeDistWidget, DateAxisItem, _visible_alpha
+
+_BAND_ROWS = 20  # image rows per lane in the density image
+
+
+class TimeLanesWidget(InstrumentedWidget, pg.PlotWidget):
+    """
+    Event distributions of several categories as horizontal lanes of one plot: one date axis, one view box
+    and one view-change pass for all lanes, so zooming/panning is synchronized by construction.
+
+    All lanes live in one buffer sorted per lane; lane k is `timestamps[offsets[k]:offsets[k + 1]]`.
+    """
+
+    def __init__(self, parent=None, background=None, lane_height: Optional[int] = 30,
+                 lod_threshold: Optional[int] = 20000, alpha_levels: int = 16, update_interval: int = 16, **kwargs):
+        super().__init__(parent=parent, background=background, axisItems={'bottom': DateAxisItem(orientation='bottom')}, **kwargs)
+
+        self.instrumentation = Instrumentation(self)
+        self.getAxis('bottom').instrumentation = self.instrumentation
+
+        self.hideAxis('right')
+        self.hideAxis('top')
+        self.showAxis('left', show=True)
+        self.getAxis('left').setStyle(tickLength=0)
+
+        self.setMouseEnabled(x=True, y=False)
+        self.plotItem.vb.disableAutoRange(axis=pg.ViewBox.YAxis)
+        self.plotItem.vb.invertY(True)  # first lane on top
+
+        self.lane_height = lane_height  # fixed pixel height of one lane, None leaves the widget height alone
+        self.lod_threshold = lod_threshold  # above this many visible events a lane is drawn as a density band
+        self.alpha_levels = max(int(alpha_levels), 2)
+        self.jitter = 0.35
+
+        self.names = []
+        self.colors = []
+        self._default_colors = True  # colors follow the style palette
+        self.timestamps = np.empty(0, dtype=np.float64)
+        self._y = np.empty(0, dtype=np.float64)
+        self.offsets = np.zeros(1, dtype=np.int64)
+
+        self.scatters = []  # one per lane, reused between setData calls
+        self._alpha_levels = []
+        self._loaded = []  # lanes whose points are in their scatter, dense lanes are loaded on first zoom-in
+        self._brushes = {}  # (lane, alpha level) -> brush
+
+        # density bands of all lanes over the LOD threshold, one RGBA image row per lane
+        self.density = pg.ImageItem(axisOrder='row-major')
+        self.density.hide()
+        self.density.setZValue(-1)
+        self.addItem(self.density)
+
+        self._view_timer = QTimer(self)
+        self._view_timer.setSingleShot(True)
+        self._view_timer.setInterval(update_interval)
+        self._view_timer.timeout.connect(self._on_view_changed)
+        self.plotItem.vb.sigRangeChanged.connect(self._schedule_view_update)
+
+        style.changed.connect(self._apply_style)
+
+    def _apply_style(self):
+        """Recolor lanes drawn with default colors in place after a palette change"""
+        if not self._default_colors or not self.names:
+            return
+        self.colors = style.colors(len(self.names))
+        self._brushes = {}
+        self._alpha_levels = [None] * len(self.names)
+        self._on_view_changed()
+
+    def _schedule_view_update(self, *args):
+        if not self._view_timer.isActive():
+            self._view_timer.start()
+
+    def _pending_work(self):
+        return [(self._view_timer, self._on_view_changed)]
+
+    def setData(self, lanes: Union[dict, list], colors: Optional[list] = None, unit: str = 's',
+                assume_sorted: bool = False):
+        """
+        `lanes` maps lane names to events or is a list of event collections (named "Lane 0", "Lane 1", ...).
+        Events are anything `TimeDistWidget.setData` accepts.
+        """
+        t0 = self.instrumentation.start()
+        if isinstance(lanes, dict):
+            names, values = list(lanes.keys()), list(lanes.values())
+        else:
+            names, values = [f"Lane {i}" for i in range(len(lanes))], list(lanes)
+        n = len(values)
+
+        parts = []
+        for v in values:
+            if v is None or len(v) == 0:
+                parts.append(np.empty(0, dtype=np.float64))
+            else:
+                parts.append(TimeDistWidget._sorted(TimeDistWidget._to_timestamps(v, unit), v, assume_sorted))
+        sizes = np.array([len(p) for p in parts], dtype=np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(sizes)))
+        self.timestamps = np.concatenate(parts) if n else np.empty(0, dtype=np.float64)
+        self._y = np.repeat(np.arange(n, dtype=np.float64), sizes)
+        self._y += np.random.uniform(-self.jitter, self.jitter, size=len(self._y))
+
+        self.names = [str(name) for name in names]
+        self._default_colors = colors is None
+        self.colors = list(colors) if colors is not None else style.colors(n)
+        self._brushes = {}
+        self._alpha_levels = [None] * n
+        self._loaded = [False] * n
+
+        while len(self.scatters) < n:
+            scatter = pg.ScatterPlotItem(size=9, pen=None)
+            self.addItem(scatter)
+            self.scatters.append(scatter)
+        for scatter in self.scatters:
+            scatter.clear()
+            scatter.hide()
+
+        self.getAxis('left').setTicks([list(enumerate(self.names)), []])
+        self.setYRange(-0.5, n - 0.5, padding=0)
+        self.setLimits(yMin=-0.5, yMax=max(n, 1) - 0.5)
+        if self.lane_height is not None:
+            self.setFixedHeight(max(n, 1) * self.lane_height + 35)
+
+        if len(self.timestamps):
+            first, last = self.timestamps.min(), self.timestamps.max()  # lanes are sorted one by one only
+            if first == last:
+                first, last = first - 86400 * 5, last + 86400 * 5
+            span = last - first
+            self.setLimits(xMin=first - span * 0.05, xMax=last + span * 0.05, minXRange=1e-5, maxXRange=span * 1.15)
+            self.setXRange(first, last, padding=0.02)
+        self._on_view_changed()
+        self.instrumentation.stop('setData', t0)
+
+    def lane(self, index: Union[int, str]) -> np.ndarray:
+        """Sorted timestamps of one lane (a view of the shared buffer)"""
+        if isinstance(index, str):
+            index = self.names.index(index)
+        return self.timestamps[self.offsets[index]:self.offsets[index + 1]]
+
+    def _on_view_changed(self):
+        """One pass over all lanes per (coalesced) zoom/pan"""
+        t0 = self.instrumentation.start()
+        self._update_view()
+        self.instrumentation.stop('viewChange', t0)
+
+    def _lane_indices(self, values: np.ndarray, side: str) -> np.ndarray:
+        """searchsorted of `values` into every lane, as absolute buffer indices of shape (lanes, len(values))"""
+        n = len(self.names)
+        out = np.empty((n, len(values)), dtype=np.int64)
+        for k in range(n):
+            lo, hi = self.offsets[k], self.offsets[k + 1]
+            out[k] = lo + np.searchsorted(self.timestamps[lo:hi], values, side=side)
+        return out
+
+    def _update_view(self):
+        n = len(self.names)
+        if n == 0 or len(self.timestamps) == 0:
+            self.density.hide()
+            return
+        xmin, xmax = self.viewRange()[0]
+        bounds = self._lane_indices(np.array([xmin, xmax]), 'left')
+        visible = bounds[:, 1] - bounds[:, 0]
+        dense = (visible > self.lod_threshold) if self.lod_threshold is not None else np.zeros(n, dtype=bool)
+
+        if dense.any():
+            self._update_density(xmin, xmax, dense)
+        elif self.density.isVisible():
+            self.density.hide()
+
+        for k in range(n):
+            scatter = self.scatters[k]
+            if dense[k]:
+                scatter.hide()
+                continue
+            if not self._loaded[k]:
+                lo, hi = self.offsets[k], self.offsets[k + 1]
+                scatter.setData(x=self.timestamps[lo:hi], y=self._y[lo:hi])
+                self._loaded[k] = True
+            scatter.show()
+            level = round(_visible_alpha(int(visible[k])) * (self.alpha_levels - 1) / 255.0)
+            if level != self._alpha_levels[k]:
+                self._alpha_levels[k] = level
+                scatter.setBrush(self._level_brush(k, level))
+
+    def _level_brush(self, lane: int, level: int):
+        brush = self._brushes.get((lane, level))
+        if brush is None:
+            color = self.colors[lane % len(self.colors)]
+            r, g, b, _ = pg.mkColor(color).getRgb()
+            alpha = max(int(round(level * 255.0 / (self.alpha_levels - 1))), 1)
+            brush = self._brushes[(lane, level)] = style.brush((r, g, b, alpha))
+        return brush
+
+    def _update_density(self, xmin, xmax, dense: np.ndarray):
+        """Heat bands of the `dense` lanes, one bin per horizontal pixel, in a single RGBA image"""
+        self.instrumentation.count('densityUpdates')
+        bins = max(int(self.plotItem.vb.width()), 1)
+        edges = np.linspace(xmin, xmax, bins + 1)
+        counts = np.diff(self._lane_indices(edges, 'left'), axis=1)
+        level = np.log1p(counts.astype(np.float64))
+        level /= max(float(level.max()), 1.0)
+
+        n = len(self.names)
+        img = np.zeros((n, _BAND_ROWS, bins, 4), dtype=np.ubyte)
+        colors = [pg.mkColor(self.colors[k % len(self.colors)]).getRgb()[:3] for k in range(n)]  # as _level_brush
+        img[..., :3] = np.array(colors, dtype=np.ubyte)[:, None, None, :]
+        # each lane spans _BAND_ROWS image rows, only those within the jitter band are painted
+        band = np.abs((np.arange(_BAND_ROWS) + 0.5) / _BAND_ROWS - 0.5) <= self.jitter
+        alpha = img[..., 3]
+        alpha[:, band, :] = np.where(dense[:, None], level * 255, 0).astype(np.ubyte)[:, None, :]
+
+        self.density.setImage(img.reshape(n * _BAND_ROWS, bins, 4), autoLevels=False)
+        self.density.setRect(QRectF(xmin, -0.5, xmax - xmin, len(self.names)))
+        if not self.density.isVisible():
+            self.density.show()
@@ -1,2 +1,30 @@
-from ._TimeDistWidget import TimeDistWidget
-from ._PiePlotWidget import PiePlotWidget
\ No newline at end of file
+# Public names are imported on first access (PEP 562), so `import pqgext` does not load Qt, pyqtgraph or NumPy
+# and a tool using one widget only imports that widget's module.
+_exports = {
+    "TimeDistWidget": "._TimeDistWidget",
+    "PiePlotWidget": "._PiePlotWidget",
+    "TimeLanesWidget": "._TimeLanesWidget",
+    "SunburstWidget": "._SunburstWidget",
+    "PieGridWidget": "._PieGridWidget",
+    "EventSource": "._source",
+    "MemmapEventSource": "._source",
+    "export_widget": "._export",
+    "render_chart": "._export",
+    "export_charts": "._export",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    module = _exports.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
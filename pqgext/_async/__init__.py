@@ -0,0 +1 @@
+from .loader import AsyncLoader
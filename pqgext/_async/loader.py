@@ -0,0 +1,95 @@
+from typing import Callable
+from pyqtgraph.Qt.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from .._instrument import logger
+
+
+class _JobSignals(QObject):
+    finished = pyqtSignal(int, object)  # token, result
+    failed = pyqtSignal(int, object)    # token, exception
+
+
+class _Job(QRunnable):
+    def __init__(self, loader: 'AsyncLoader', token: int, func: Callable, args: tuple):
+        super().__init__()
+        self._loader = loader
+        self._token = token
+        self._func = func
+        self._args = args
+
+    def run(self):
+        cancelled = lambda: self._token != self._loader.token  # a newer request supersedes this one
+        if cancelled():
+            return
+        try:
+            result = self._func(*self._args, cancelled=cancelled)
+        except Exception as e:
+            self._loader._signals.failed.emit(self._token, e)
+            return
+        if result is not None and not cancelled():
+            self._loader._signals.finished.emit(self._token, result)
+
+
+class AsyncLoader(QObject):
+    """
+    Runs data preparation on a QThreadPool and hands the result of the newest request back to the GUI thread.
+
+    `func(*args, cancelled=callable)` is executed on a worker thread; it may return None early once
+    `cancelled()` is true. Results of superseded requests are dropped, `ready` receives the rest.
+
+    Incremental updates made while a result is pending (appends to data that is still being prepared) are
+    queued with `defer` and run right after `ready`; a newer request or `cancel` drops them with the result.
+    """
+    ready = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+    def __init__(self, parent=None, pool: QThreadPool = None):
+        super().__init__(parent)
+        self._pool = pool or QThreadPool.globalInstance()
+        self.token = 0
+        self._pending = False
+        self._deferred = []
+        # lives in the GUI thread, so worker emits are queued back to it
+        self._signals = _JobSignals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    @property
+    def pending(self) -> bool:
+        """A submitted result has not been delivered yet"""
+        return self._pending
+
+    def submit(self, func: Callable, *args) -> int:
+        self.token += 1
+        self._pending = True
+        self._deferred = []
+        self._pool.start(_Job(self, self.token, func, args))
+        return self.token
+
+    def cancel(self):
+        """Drop whatever is pending"""
+        self.token += 1
+        self._pending = False
+        self._deferred = []
+
+    def defer(self, func: Callable, *args) -> bool:
+        """Run `func(*args)` after the pending result has been delivered; False (nothing queued) if none is"""
+        if not self._pending:
+            return False
+        self._deferred.append((func, args))
+        return True
+
+    def _on_finished(self, token, result):
+        if token == self.token:
+            self._pending = False
+            self.ready.emit(result)
+            deferred, self._deferred = self._deferred, []
+            for func, args in deferred:
+                func(*args)
+
+    def _on_failed(self, token, error):
+        if token == self.token:
+            self._pending = False
+            self._deferred = []
+            logger.error("async data preparation failed: %r", error)
+            self.failed.emit(error)
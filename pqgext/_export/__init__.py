@@ -0,0 +1 @@
+from .export import export_widget, render_chart, export_charts
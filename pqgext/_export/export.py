@@ -0,0 +1,116 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Union
+
+from .._instrument import logger
+
+
+def _widget_classes() -> dict:
+    from .._TimeDistWidget import TimeDistWidget
+    from .._PiePlotWidget import PiePlotWidget
+    from .._TimeLanesWidget import TimeLanesWidget
+    from .._SunburstWidget import SunburstWidget
+    from .._PieGridWidget import PieGridWidget
+    return {"TimeDistWidget": TimeDistWidget, "PiePlotWidget": PiePlotWidget, "TimeLanesWidget": TimeLanesWidget,
+            "SunburstWidget": SunburstWidget, "PieGridWidget": PieGridWidget}
+
+
+_app = None  # QApplication created by the exporter, kept alive for the lifetime of the process
+
+
+def _application():
+    """The running QApplication, or a new offscreen one when there is none (scripts, pool workers)"""
+    global _app
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from pyqtgraph.Qt.QtWidgets import QApplication
+    app = QApplication.instance()
+    if app is None:
+        app = _app = QApplication([])
+    return app
+
+
+def export_widget(widget, path: str, fmt: Optional[str] = None) -> str:
+    """
+    Write a (possibly never shown) pqgext widget to `path`. `fmt` defaults to the file extension;
+    'svg' goes through pyqtgraph's SVGExporter, anything else is a raster format QPixmap can save (png, jpg, ...).
+    """
+    fmt = (fmt or os.path.splitext(path)[1][1:] or "png").lower()
+    app = _application()
+    app.processEvents()
+    if hasattr(widget, "_flush_pending"):
+        widget._flush_pending()
+
+    if fmt == "svg":
+        from pyqtgraph.exporters import SVGExporter
+        SVGExporter(widget.scene()).export(path)
+    elif not widget.grab().save(path, fmt.upper()):
+        raise OSError(f"Could not write '{path}' as {fmt}")
+    return path
+
+
+def render_chart(widget: Union[str, type], path: str, data: Optional[dict] = None, options: Optional[dict] = None,
+                 size: tuple[int, int] = (800, 600), legend: bool = False, fmt: Optional[str] = None) -> str:
+    """
+    Create `widget` (class or class name, e.g. "PiePlotWidget") with `options`, pass `data` to its setData,
+    and render it to `path` offscreen, without showing a window.
+    """
+    from pyqtgraph.Qt.QtCore import Qt
+
+    app = _application()
+    if isinstance(widget, str):
+        classes = _widget_classes()
+        if widget not in classes:
+            raise ValueError(f"Unknown widget '{widget}', expected one of {', '.join(classes)}")
+        widget = classes[widget]
+    w = widget(**(options or {}))
+    # lay the widget out as if it were shown, but never map it to the screen
+    w.setAttribute(Qt.WA_DontShowOnScreen)
+    w.resize(*size)
+    w.show()
+    try:
+        if data is not None:
+            w.setData(**data)
+        if legend:
+            w.add_legend()
+        app.processEvents()
+        return export_widget(w, path, fmt)
+    finally:
+        w.close()
+        w.deleteLater()
+
+
+def _render_job(job: dict) -> str:
+    return render_chart(**job)
+
+
+def export_charts(jobs: list[dict], processes: Optional[int] = None) -> list[Union[str, Exception]]:
+    """
+    Render many charts on a process pool, one offscreen QApplication per worker.
+
+    Every job is a dict of `render_chart` keyword arguments (widget, path, data, options, size, legend, fmt),
+    so its data has to be picklable. `processes` defaults to the number of CPUs, 0 renders serially in
+    this process. Returns, in job order, the written path or the exception the job failed with.
+    """
+    if processes == 0:
+        results = []
+        for job in jobs:
+            try:
+                results.append(_render_job(job))
+            except Exception as e:
+                logger.error("export of '%s' failed: %r", job.get("path"), e)
+                results.append(e)
+        return results
+
+    # Qt must not be forked with a live QApplication, workers start from a clean interpreter
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processes, mp_context=ctx) as pool:
+        futures = [pool.submit(_render_job, job) for job in jobs]
+        results = []
+        for job, future in zip(jobs, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.error("export of '%s' failed: %r", job.get("path"), e)
+                results.append(e)
+    return results
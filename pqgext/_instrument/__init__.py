@@ -0,0 +1 @@
+from .instrument import Instrumentation, InstrumentedWidget, logger
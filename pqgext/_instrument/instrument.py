@@ -0,0 +1,118 @@
+import math
+import time
+import logging
+from typing import Optional
+from pyqtgraph.Qt.QtCore import QObject, QTimer, pyqtSignal
+
+from .._settings import pqgext_settings as pes
+
+# debug messages of all widgets; formatting only happens when DEBUG is enabled for "pqgext"
+logger = logging.getLogger("pqgext")
+
+_HIST_BUCKETS = 32  # bucket i counts durations in [2^(i-1), 2^i) microseconds
+
+
+class Instrumentation(QObject):
+    """
+    Opt-in counters and timing histograms of a widget's hot paths.
+
+        t0 = self.instrumentation.start()
+        ...
+        self.instrumentation.stop('setData', t0)
+
+    While disabled `start` returns None and `stop` returns immediately, nothing is recorded.
+    """
+    statsUpdated = pyqtSignal(dict)
+
+    def __init__(self, parent=None, enabled: Optional[bool] = None):
+        super().__init__(parent)
+        self.enabled = pes.instrumentation if enabled is None else enabled
+        self._timings = {}  # name -> [count, total, max, histogram]
+        self._counters = {}
+        self._dirty = False
+        self._emit_timer = None
+
+    def start(self) -> Optional[float]:
+        return time.perf_counter() if self.enabled else None
+
+    def stop(self, name: str, t0: Optional[float]):
+        if t0 is None:
+            return
+        dt = time.perf_counter() - t0
+        entry = self._timings.get(name)
+        if entry is None:
+            entry = self._timings[name] = [0, 0.0, 0.0, [0] * _HIST_BUCKETS]
+        entry[0] += 1
+        entry[1] += dt
+        if dt > entry[2]:
+            entry[2] = dt
+        bucket = math.frexp(dt * 1e6)[1] if dt > 0 else 0
+        entry[3][min(max(bucket, 0), _HIST_BUCKETS - 1)] += 1
+        self._dirty = True
+
+    def count(self, name: str, n: int = 1):
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + n
+            self._dirty = True
+
+    def stats(self) -> dict:
+        """{'timings': {name: {count, total, mean, max, histogram}}, 'counters': {name: value}}, seconds"""
+        timings = {}
+        for name, (count, total, longest, hist) in self._timings.items():
+            timings[name] = {
+                'count': count,
+                'total': total,
+                'mean': total / count,
+                'max': longest,
+                # upper bucket bound in microseconds -> number of calls
+                'histogram': {2 ** i: c for i, c in enumerate(hist) if c},
+            }
+        return {'timings': timings, 'counters': dict(self._counters)}
+
+    def reset(self):
+        self._timings.clear()
+        self._counters.clear()
+        self._dirty = False
+
+    def setEmitInterval(self, interval: Optional[int]):
+        """Emit `statsUpdated` every `interval` ms while something was recorded, None stops it"""
+        if interval is None:
+            if self._emit_timer is not None:
+                self._emit_timer.stop()
+            return
+        if self._emit_timer is None:
+            self._emit_timer = QTimer(self)
+            self._emit_timer.timeout.connect(self._emit_stats)
+        self._emit_timer.start(interval)
+
+    def _emit_stats(self):
+        if self._dirty:
+            self._dirty = False
+            self.statsUpdated.emit(self.stats())
+
+
+class InstrumentedWidget:
+    """
+    Mixin of the pqgext widgets (listed before the pyqtgraph base class): `stats()`, a timed `paintEvent` and
+    `_flush_pending`, which the exporter calls to run coalesced work still waiting for its timer. Widgets set
+    `self.instrumentation` and list their (single-shot timer, callback) pairs in `_pending_work`.
+    """
+
+    def stats(self) -> dict:
+        """Counters and timing histograms, recorded while `self.instrumentation.enabled` is set"""
+        return self.instrumentation.stats()
+
+    def paintEvent(self, ev):
+        t0 = self.instrumentation.start()
+        super().paintEvent(ev)
+        self.instrumentation.stop('paint', t0)
+
+    def _pending_work(self) -> list:
+        return []
+
+    def _flush_pending(self):
+        """Run pending coalesced work now (before grabbing/exporting the widget)"""
+        for timer, callback in self._pending_work():
+            if timer.isActive():
+                timer.stop()
+                callback()
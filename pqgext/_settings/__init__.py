@@ -3,4 +3,5 @@ from .settings import PQGExtSettings
 pqgext_settings = PQGExtSettings(primary_color=None,
                                  secondary_color=None,
                                  palette=None,
+                                 instrumentation=False,
                                  )
\ No newline at end of file
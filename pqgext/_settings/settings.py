@@ -1,9 +1,20 @@
 from typing import Optional
+from pyqtgraph.Qt.QtCore import QObject, pyqtSignal
 from pyqtgraph.Qt.QtGui import QColor
 
 
-class PQGExtSettings:
-    def __init__(self, primary_color: Optional[QColor] = None, secondary_color: Optional[QColor] = None, palette: list[QColor] = None):
+class PQGExtSettings(QObject):
+    changed = pyqtSignal(str)  # name of the setting that was assigned
+
+    def __init__(self, primary_color: Optional[QColor] = None, secondary_color: Optional[QColor] = None, palette: list[QColor] = None,
+                 instrumentation: bool = False):
+        super().__init__()
         self.primary_color = primary_color
         self.secondary_color = secondary_color
-        self.palette = palette
\ No newline at end of file
+        self.palette = palette
+        self.instrumentation = instrumentation  # default for new widgets, see Instrumentation
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if not name.startswith('_'):
+            self.changed.emit(name)
@@ -0,0 +1 @@
+from .source import EventSource, MemmapEventSource
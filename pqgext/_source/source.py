@@ -0,0 +1,189 @@
+import os
+import logging
+from typing import Optional
+
+import numpy as np
+
+from .units import _UNIT_DIVISORS
+
+logger = logging.getLogger("pqgext")  # the widgets' logger, without importing Qt
+
+_CHUNK = 1 << 22  # events read at once while building the pyramid
+
+
+class EventSource:
+    """
+    Sorted event timestamps for `TimeDistWidget.setSource`, stored as epoch numbers in `unit`
+    ('s', 'ms', 'us', 'ns'). Queries take and return float64 seconds, lookups are binary searches,
+    so the array may be a memory map that is never read as a whole.
+
+    Bounds at or beyond `first`/`last` are exact. Bounds inside the data are compared at float64 precision,
+    which for today's epochs in 'ns' is about a quarter of a microsecond.
+    """
+
+    def __init__(self, timestamps: np.ndarray, unit: str = 's'):
+        if unit not in _UNIT_DIVISORS:
+            raise ValueError(f"Unknown time unit '{unit}', expected one of {list(_UNIT_DIVISORS)}")
+        self.raw = timestamps
+        self.unit = unit
+        self._divisor = _UNIT_DIVISORS[unit]
+
+    def __len__(self):
+        return len(self.raw)
+
+    @property
+    def first(self) -> float:
+        return float(self.raw[0]) / self._divisor
+
+    @property
+    def last(self) -> float:
+        return float(self.raw[-1]) / self._divisor
+
+    def _to_seconds(self, raw: np.ndarray) -> np.ndarray:
+        seconds = raw.astype(np.float64)
+        if self._divisor != 1.0:
+            seconds /= self._divisor
+        return seconds
+
+    def _index(self, seconds, side: str) -> np.ndarray:
+        """searchsorted of `seconds` into the raw array, without casting the (mapped) array to float"""
+        seconds = np.asarray(seconds, dtype=np.float64)
+        n = len(self.raw)
+        if n == 0:
+            return np.zeros(seconds.shape, dtype=np.int64)
+        # out-of-range bounds are answered directly: they need no cast into the raw dtype (which could overflow)
+        # and `first`/`last` themselves match although they went through float seconds
+        first, last = self.first, self.last
+        if side == 'left':
+            before, after = seconds <= first, seconds > last
+        else:
+            before, after = seconds < first, seconds >= last
+        values = np.clip(np.nan_to_num(seconds, nan=first), first, last) * self._divisor
+        if self.raw.dtype.kind in 'iu':
+            # a[i] >= v  <=>  a[i] >= ceil(v) and  a[i] > v  <=>  a[i] > floor(v) for integer a
+            values = np.ceil(values) if side == 'left' else np.floor(values)
+        values = np.clip(values, float(self.raw[0]), float(self.raw[-1])).astype(self.raw.dtype)
+        index = np.searchsorted(self.raw, values, side=side)
+        return np.where(before, 0, np.where(after, n, index))
+
+    def time(self, index: int) -> float:
+        """Timestamp of event `index` in seconds"""
+        return float(self.raw[index]) / self._divisor
+
+    def indices(self, lo: float, hi: float) -> tuple[int, int]:
+        """Index range [left, right) of the events in [lo, hi]"""
+        return int(self._index(lo, 'left')), int(self._index(hi, 'right'))
+
+    def count(self, lo: float, hi: float) -> int:
+        """Number of events in [lo, hi]"""
+        left, right = self.indices(lo, hi)
+        return right - left
+
+    def counts(self, edges: np.ndarray) -> np.ndarray:
+        """Events per bin between ascending `edges`; subclasses may approximate them for drawing"""
+        return self.exact_counts(edges)
+
+    def exact_counts(self, edges: np.ndarray) -> np.ndarray:
+        """Events per bin between ascending `edges`, always exact: one binary search per edge"""
+        return np.diff(self._index(edges, 'left'))
+
+    def slice(self, lo: float, hi: float) -> np.ndarray:
+        """Timestamps in [lo, hi] as float64 seconds; only this part of the array is read"""
+        return self._to_seconds(self.raw[self._index(lo, 'left'):self._index(hi, 'right')])
+
+
+class MemmapEventSource(EventSource):
+    """
+    Sorted timestamps in a `.npy` file or a raw binary file of `dtype`, memory-mapped read-only.
+
+    A count pyramid is kept next to the data (`<path>.pyramid.npz`, built on first open by streaming over
+    the file): level 0 holds cumulative counts of `pyramid_buckets` equal time buckets, every further level
+    halves the resolution. Binned counts of wide views are interpolated from the coarsest level fine enough
+    for the bin width, only narrow views binary-search the mapped data itself.
+    """
+
+    def __init__(self, path: str, unit: str = 's', dtype=np.int64, pyramid_path: Optional[str] = None,
+                 pyramid_buckets: int = 1 << 20):
+        if path.endswith('.npy'):
+            raw = np.load(path, mmap_mode='r')
+        else:
+            raw = np.memmap(path, dtype=dtype, mode='r')
+        super().__init__(raw.reshape(-1), unit)
+        self.path = path
+        self.pyramid_path = pyramid_path or path + '.pyramid.npz'
+        self.pyramid_buckets = int(pyramid_buckets)
+        self._levels = {}
+        self._pyramid = None
+        if len(self):
+            self._open_pyramid()
+
+    def _open_pyramid(self):
+        if os.path.exists(self.pyramid_path):
+            pyramid = np.load(self.pyramid_path)  # members are read lazily, level by level
+            if (int(pyramid['n']) == len(self) and float(pyramid['first']) == self.first
+                    and float(pyramid['last']) == self.last):
+                self._pyramid = pyramid
+                self._origin = float(pyramid['origin'])
+                self._width = float(pyramid['width'])
+                self._level_count = int(pyramid['levels'])
+                return
+            pyramid.close()
+            logger.debug("count pyramid %s does not match %s, rebuilding", self.pyramid_path, self.path)
+        self._build_pyramid()
+
+    def _build_pyramid(self):
+        n = len(self)
+        buckets = max(self.pyramid_buckets, 1)
+        self._origin = self.first
+        span = self.last - self._origin
+        self._width = span / buckets * (1 + 1e-9) if span > 0 else 1.0
+
+        counts = np.zeros(buckets, dtype=np.int64)
+        for start in range(0, n, _CHUNK):
+            seconds = self._to_seconds(self.raw[start:start + _CHUNK])
+            idx = ((seconds - self._origin) / self._width).astype(np.int64)
+            np.clip(idx, 0, buckets - 1, out=idx)
+            counts += np.bincount(idx, minlength=buckets)
+
+        levels = {}
+        level = 0
+        while True:
+            prefix = np.zeros(len(counts) + 1, dtype=np.int64)
+            np.cumsum(counts, out=prefix[1:])
+            levels[f'level{level}'] = prefix
+            if len(counts) <= 256:
+                break
+            if len(counts) % 2:
+                counts = np.append(counts, 0)
+            counts = counts[0::2] + counts[1::2]
+            level += 1
+        self._level_count = level + 1
+        self._levels = {int(k[5:]): v for k, v in levels.items()}
+
+        try:
+            np.savez(self.pyramid_path, n=n, first=self.first, last=self.last, origin=self._origin,
+                     width=self._width, levels=self._level_count, **levels)
+        except OSError as e:
+            logger.warning("could not store count pyramid %s: %r", self.pyramid_path, e)
+
+    def _level(self, k: int) -> np.ndarray:
+        prefix = self._levels.get(k)
+        if prefix is None:
+            prefix = self._levels[k] = self._pyramid[f'level{k}']
+        return prefix
+
+    def counts(self, edges: np.ndarray) -> np.ndarray:
+        edges = np.asarray(edges, dtype=np.float64)
+        if len(self) == 0 or len(edges) < 2:
+            return self.exact_counts(edges)
+        bin_width = float(np.min(np.diff(edges)))
+        # coarsest level whose buckets are at most 1/8 of a bin; interpolation error stays well below a bin
+        k = int(np.floor(np.log2(bin_width / (8 * self._width)))) if bin_width > 0 else -1
+        if k < 0:
+            return self.exact_counts(edges)
+        k = min(k, self._level_count - 1)
+        prefix = self._level(k)
+        pos = np.clip((edges - self._origin) / (self._width * 2 ** k), 0, len(prefix) - 1)
+        i = np.minimum(pos.astype(np.int64), len(prefix) - 2)
+        cumulative = prefix[i] + (pos - i) * (prefix[i + 1] - prefix[i])
+        return np.maximum(np.diff(np.rint(cumulative).astype(np.int64)), 0)
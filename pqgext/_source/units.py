@@ -0,0 +1,2 @@
+# divisors converting epoch numbers in the given unit to seconds; no Qt imports, shared by sources and widgets
+_UNIT_DIVISORS = {'s': 1.0, 'ms': 1e3, 'us': 1e6, 'ns': 1e9}
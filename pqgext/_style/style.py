@@ -1,34 +1,101 @@
 import pyqtgraph as pg
+from functools import lru_cache
+from pyqtgraph.Qt.QtCore import QObject, pyqtSignal
 from pyqtgraph.Qt.QtGui import QColor
 
 from .._settings import pqgext_settings as pes
 
+_DEFAULT_PRIMARY = QColor(50, 120, 220)
+_DEFAULT_SECONDARY = QColor(220, 120, 50)
+_MAX_INTERNED = 4096  # brushes/pens kept by the style before the cache starts over
+
+
+@lru_cache(maxsize=256)
+def _palette(length: int, alpha: int) -> tuple:
+    return tuple(pg.intColor(i, length, alpha=alpha) for i in range(length))
+
+
+class PQGExtStyle(QObject):
+    """
+    Colors, palettes, brushes and pens shared by all widgets. Everything returned is cached and shared,
+    so it must not be modified in place. `changed` is emitted whenever a style-related setting of
+    `pqgext_settings` is assigned; widgets connect to it and restyle themselves.
+    """
+    changed = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self._palette = None
+        self._brushes = {}
+        self._pens = {}
+        pes.changed.connect(self._on_settings_changed)
+
+    def _on_settings_changed(self, name: str):
+        if name == 'instrumentation':
+            return
+        self._palette = None
+        self.changed.emit()
 
-class PQGExtStyle:
     @staticmethod
     def generate_palette(length: int, alpha: int = 255):
-        return [pg.intColor(i, length, alpha=alpha) for i in range(length)]
+        return list(_palette(length, alpha))
 
     @property
     def palette(self):
-        if pes.palette is None:
-            def_palette = self.generate_palette(10)
-            return def_palette
-        else:
-            return pes.palette
+        if self._palette is None:
+            self._palette = tuple(pes.palette) if pes.palette is not None else _palette(10, 255)
+        return list(self._palette)
+
+    def colors(self, length: int, alpha: int = 255) -> list[QColor]:
+        """`length` colors: the configured palette if it is long enough, a generated one otherwise"""
+        if pes.palette is None or len(pes.palette) < length:
+            return self.generate_palette(length, alpha)
+        colors = self.palette[:length]
+        if alpha != 255:
+            colors = [QColor(c.red(), c.green(), c.blue(), alpha) for c in colors]
+        return colors
+
+    def color(self, index: int, alpha: int = 255) -> QColor:
+        """
+        Color `index` of an open-ended sequence: the configured palette while it lasts, then golden-ratio hues.
+        Unlike `colors(length)`, a color never depends on how many colors are in use.
+        """
+        if pes.palette is not None and index < len(pes.palette):
+            c = self.palette[index]
+            return QColor(c.red(), c.green(), c.blue(), alpha)
+        return pg.hsvColor((index * 0.618033988749895) % 1.0, sat=0.85, val=0.9, alpha=alpha / 255.0)
 
     @property
     def primary_color(self) -> QColor:
         if pes.primary_color is None:
-            def_prim_col = QColor(50, 120, 220)
-            return def_prim_col
+            return _DEFAULT_PRIMARY
         else:
             return pes.primary_color
 
     @property
     def secondary_color(self) -> QColor:
         if pes.secondary_color is None:
-            def_sec_col = QColor(220, 120, 50)
-            return def_sec_col
+            return _DEFAULT_SECONDARY
         return pes.secondary_color
 
+    def brush(self, color):
+        """Interned brush of `color` (anything pg.mkColor accepts)"""
+        key = pg.mkColor(color).getRgb()
+        brush = self._brushes.get(key)
+        if brush is None:
+            if len(self._brushes) >= _MAX_INTERNED:
+                self._brushes.clear()
+            brush = self._brushes[key] = pg.mkBrush(key)
+        return brush
+
+    def pen(self, color, width: float = 1, cosmetic: bool = True):
+        """Interned pen of `color` and `width`"""
+        key = (pg.mkColor(color).getRgb(), width, cosmetic)
+        pen = self._pens.get(key)
+        if pen is None:
+            if len(self._pens) >= _MAX_INTERNED:
+                self._pens.clear()
+            pen = pg.mkPen(key[0], width=width)
+            pen.setCosmetic(cosmetic)
+            self._pens[key] = pen
+        return pen